@@ -44,6 +44,8 @@ def run_migrations_online() -> None:
             connection=connection,
             target_metadata=target_metadata,
             compare_type=True,
+            # SQLite can't ALTER constraints/columns in place; batch ops recreate the table.
+            render_as_batch=connection.dialect.name == "sqlite",
         )
 
         with context.begin_transaction():
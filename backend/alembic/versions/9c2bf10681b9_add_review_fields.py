@@ -18,55 +18,45 @@ branch_labels: Union[str, Sequence[str], None] = None
 depends_on: Union[str, Sequence[str], None] = None
 
 
+def _is_sqlite() -> bool:
+    return op.get_bind().dialect.name == "sqlite"
+
+
 def upgrade() -> None:
     """Upgrade schema."""
-    # Keep FK behavior stable (CASCADE) for join table
-    op.drop_constraint(op.f("question_tags_tag_id_fkey"), "question_tags", type_="foreignkey")
-    op.drop_constraint(op.f("question_tags_question_id_fkey"), "question_tags", type_="foreignkey")
+    # Keep FK behavior stable (CASCADE) for join table.
+    # SQLite: the FKs are unnamed and already CASCADE from the initial migration.
+    if not _is_sqlite():
+        _recreate_join_fks()
 
-    op.create_foreign_key(
-        op.f("question_tags_question_id_fkey"),
-        "question_tags",
-        "questions",
-        ["question_id"],
-        ["id"],
-        ondelete="CASCADE",
-    )
-    op.create_foreign_key(
-        op.f("question_tags_tag_id_fkey"),
-        "question_tags",
-        "tags",
-        ["tag_id"],
-        ["id"],
-        ondelete="CASCADE",
-    )
-
-    # Add NOT NULL columns safely (existing rows need defaults)
-    op.add_column(
-        "questions",
-        sa.Column("review_count", sa.Integer(), nullable=False, server_default="0"),
-    )
-    op.add_column(
-        "questions",
-        sa.Column("mastery_score", sa.Float(), nullable=False, server_default="0"),
-    )
-    op.add_column(
-        "questions",
-        sa.Column("next_review_at", sa.DateTime(), nullable=False, server_default=sa.text("now()")),
-    )
+    # Add NOT NULL columns safely (existing rows need defaults).
+    # Batch mode is a plain ALTER on Postgres and a table copy on SQLite.
+    with op.batch_alter_table("questions") as batch:
+        batch.add_column(sa.Column("review_count", sa.Integer(), nullable=False, server_default="0"))
+        batch.add_column(sa.Column("mastery_score", sa.Float(), nullable=False, server_default="0"))
+        batch.add_column(
+            sa.Column("next_review_at", sa.DateTime(), nullable=False, server_default=sa.func.now())
+        )
 
     # Optional cleanup: remove server defaults so app controls values
-    op.alter_column("questions", "review_count", server_default=None)
-    op.alter_column("questions", "mastery_score", server_default=None)
-    op.alter_column("questions", "next_review_at", server_default=None)
+    with op.batch_alter_table("questions") as batch:
+        batch.alter_column("review_count", server_default=None)
+        batch.alter_column("mastery_score", server_default=None)
+        batch.alter_column("next_review_at", server_default=None)
 
 
 def downgrade() -> None:
     """Downgrade schema."""
-    op.drop_column("questions", "next_review_at")
-    op.drop_column("questions", "mastery_score")
-    op.drop_column("questions", "review_count")
+    with op.batch_alter_table("questions") as batch:
+        batch.drop_column("next_review_at")
+        batch.drop_column("mastery_score")
+        batch.drop_column("review_count")
+
+    if not _is_sqlite():
+        _recreate_join_fks()
+
 
+def _recreate_join_fks() -> None:
     op.drop_constraint(op.f("question_tags_tag_id_fkey"), "question_tags", type_="foreignkey")
     op.drop_constraint(op.f("question_tags_question_id_fkey"), "question_tags", type_="foreignkey")
 
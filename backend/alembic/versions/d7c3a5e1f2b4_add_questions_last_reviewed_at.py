@@ -0,0 +1,32 @@
+"""add questions last_reviewed_at
+
+Revision ID: d7c3a5e1f2b4
+Revises: b41e7c2d9a10
+Create Date: 2026-10-19 20:12:40.551903
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd7c3a5e1f2b4'
+down_revision: Union[str, Sequence[str], None] = 'b41e7c2d9a10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('questions') as batch_op:
+        batch_op.add_column(sa.Column('last_reviewed_at', sa.DateTime(), nullable=True))
+    # Best available value for existing reviewed cards.
+    op.execute("UPDATE questions SET last_reviewed_at = updated_at WHERE review_count > 0")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('questions') as batch_op:
+        batch_op.drop_column('last_reviewed_at')
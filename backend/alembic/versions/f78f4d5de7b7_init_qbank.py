@@ -28,9 +28,9 @@ def upgrade() -> None:
         sa.Column("answer_md", sa.Text(), server_default="", nullable=False),
         sa.Column("difficulty", sa.Integer(), server_default="3", nullable=False),
         sa.Column("source", sa.String(length=300), server_default="", nullable=False),
-        sa.Column("is_flagged", sa.Boolean(), server_default=sa.text("false"), nullable=False),
-        sa.Column("created_at", sa.DateTime(), server_default=sa.text("now()"), nullable=False),
-        sa.Column("updated_at", sa.DateTime(), server_default=sa.text("now()"), nullable=False),
+        sa.Column("is_flagged", sa.Boolean(), server_default=sa.false(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), server_default=sa.func.now(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), server_default=sa.func.now(), nullable=False),
     )
     op.create_index("ix_questions_user_id", "questions", ["user_id"])
 
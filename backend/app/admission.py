@@ -0,0 +1,145 @@
+import asyncio
+import logging
+
+from starlette.responses import JSONResponse
+
+from .settings import settings
+
+log = logging.getLogger(__name__)
+
+
+class RouteGroup:
+    """Concurrency limit plus bounded wait queue for one group of routes."""
+
+    def __init__(self, name: str, limit: int, max_queue: int):
+        self.name = name
+        self.limit = limit
+        self.max_queue = max_queue
+        self.active = 0
+        self.waiting = 0
+        self.admitted = 0
+        self.shed = 0
+        self._slots: asyncio.Semaphore | None = None
+
+    @property
+    def slots(self) -> asyncio.Semaphore:
+        # created lazily so it binds to the server's event loop
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.limit)
+        return self._slots
+
+    async def acquire(self, timeout: float) -> bool:
+        # waiting is counted before the first await, so a burst arriving in one
+        # event-loop tick already sees the requests ahead of it.
+        if self.active + self.waiting >= self.limit + self.max_queue:
+            self.shed += 1
+            return False
+
+        self.waiting += 1
+        try:
+            await asyncio.wait_for(self.slots.acquire(), timeout)
+        except asyncio.TimeoutError:
+            self.shed += 1
+            return False
+        finally:
+            self.waiting -= 1
+
+        self.active += 1
+        self.admitted += 1
+        return True
+
+    def release(self) -> None:
+        self.active -= 1
+        self.slots.release()
+
+    def snapshot(self) -> dict:
+        return {
+            "limit": self.limit,
+            "max_queue": self.max_queue,
+            "active": self.active,
+            "queue_depth": self.waiting,
+            "admitted": self.admitted,
+            "shed": self.shed,
+        }
+
+
+def parse_limits(spec: str) -> dict[str, RouteGroup]:
+    """Parse "name=limit:max_queue,..." (e.g. "auth=4:16,heavy=8:32") into route groups."""
+    groups = {}
+    for item in spec.split(","):
+        if not item.strip():
+            continue
+        name, _, sizes = item.partition("=")
+        limit, _, queue = sizes.partition(":")
+        groups[name.strip()] = RouteGroup(name.strip(), int(limit), int(queue or 0))
+    return groups
+
+
+# Paths that are never queued or shed.
+EXEMPT_PATHS = ("/health", "/metrics")
+
+
+def classify(method: str, path: str) -> str:
+    if method == "POST" and path in ("/v1/auth/login", "/v1/auth/register"):
+        return "auth"  # bcrypt
+    if (method == "GET" and path == "/v1/questions") or path.startswith("/v1/dashboard") or path == "/v1/questions/bulk":
+        return "heavy"  # unpaged list, aggregate queries, set-based writes
+    if method == "GET" and path.startswith("/v1/decks/") and path.endswith("/questions"):
+        return "heavy"  # unpaged shared deck
+    return "default"
+
+
+class AdmissionMiddleware:
+    """
+    Per-route-group admission control. Requests over a group's concurrency limit
+    wait in a bounded queue; once the queue is full (or the wait times out) they
+    get an immediate 503 with Retry-After instead of tying up threads and DB
+    connections.
+    """
+
+    def __init__(self, app, groups: dict[str, RouteGroup]):
+        self.app = app
+        self.groups = groups
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"].startswith(EXEMPT_PATHS):
+            await self.app(scope, receive, send)
+            return
+
+        group = self.groups.get(classify(scope["method"], scope["path"])) or self.groups.get("default")
+        if group is None:
+            await self.app(scope, receive, send)
+            return
+
+        if not await group.acquire(settings.ADMISSION_QUEUE_TIMEOUT):
+            response = JSONResponse(
+                {"detail": "Server busy, retry later"},
+                status_code=503,
+                headers={"Retry-After": str(settings.ADMISSION_RETRY_AFTER)},
+            )
+            await response(scope, receive, send)
+            return
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            group.release()
+
+
+def check_pool_budget(groups: dict[str, RouteGroup], pool_capacity: int, jobs: int) -> bool:
+    """
+    Whether every admitted request (plus the background job workers) can hold a DB
+    connection at once. If not, admitted requests queue again inside the pool.
+    """
+    needed = sum(g.limit for g in groups.values()) + jobs
+    if needed > pool_capacity:
+        log.warning(
+            "ADMISSION_LIMITS admit %d concurrent requests plus %d job workers, but the "
+            "database pool holds %d connections; lower the limits or raise DB_POOL_SIZE/DB_MAX_OVERFLOW",
+            needed - jobs, jobs, pool_capacity,
+        )
+        return False
+    return True
+
+
+admission_groups = parse_limits(settings.ADMISSION_LIMITS)
@@ -1,9 +1,89 @@
 import uuid
-from datetime import datetime
+from datetime import datetime, timedelta
 from sqlalchemy.orm import Session
-from sqlalchemy import select
-from . import models
-from .schemas import QuestionCreate, QuestionUpdate
+from sqlalchemy import Date, DateTime, Uuid, bindparam, delete, exists, func, literal, null, or_, select, union_all, update
+from . import models, overlay
+from .forecast import forecast_cache
+from .related import related_index
+from .render import markdown_cache
+from .scheduling import REVIEW_RULES, schedule_review
+from .tag_index import tag_index
+from .schemas import BulkAction, DeckCreate, QuestionCreate, QuestionUpdate
+from .settings import settings
+from .sqlcompat import greatest, least, upsert_insert
+
+def _add_to_rollup(db: Session, columns: list[str], rows) -> None:
+    """INSERT ... SELECT `rows` into review_daily_rollup, adding counters onto existing (user, day, tag) rows."""
+    R = models.ReviewDailyRollup
+    stmt = upsert_insert(db, R).from_select(columns, rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[R.user_id, R.day, R.tag],
+        set_={
+            "forgot_count": R.forgot_count + stmt.excluded.forgot_count,
+            "almost_count": R.almost_count + stmt.excluded.almost_count,
+            "knew_count": R.knew_count + stmt.excluded.knew_count,
+            "mastery_delta": R.mastery_delta + stmt.excluded.mastery_delta,
+        },
+    )
+    db.execute(stmt)
+
+def _record_review_rollup(db: Session, user_id: uuid.UUID, rating: str, now: datetime, mastery, where) -> None:
+    """
+    Upsert the day's all-tags row and one row per tag of the question selected by
+    `where` into review_daily_rollup. Must run before the review is applied: the
+    mastery delta is computed from `mastery`, the current (pre-review) score.
+    """
+    delta, _ = REVIEW_RULES[rating]
+    Q = models.Question
+
+    cols = [
+        literal(user_id, Uuid).label("user_id"),
+        literal(now.date(), Date).label("day"),
+        literal(int(rating == "forgot")).label("forgot_count"),
+        literal(int(rating == "almost")).label("almost_count"),
+        literal(int(rating == "knew")).label("knew_count"),
+        (least(greatest(mastery + delta, 0.0), 5.0) - mastery).label("mastery_delta"),
+    ]
+    all_tags = select(*cols, literal("").label("tag")).select_from(Q).where(*where)
+    per_tag = (
+        select(*cols, models.Tag.name)
+        .select_from(Q)
+        .join(models.QuestionTag, models.QuestionTag.question_id == Q.id)
+        .join(models.Tag, models.Tag.id == models.QuestionTag.tag_id)
+        .where(*where)
+    )
+
+    _add_to_rollup(
+        db,
+        ["user_id", "day", "forgot_count", "almost_count", "knew_count", "mastery_delta", "tag"],
+        union_all(all_tags, per_tag),
+    )
+
+def review_question(db: Session, user_id: uuid.UUID, qid: uuid.UUID, rating: str, now: datetime):
+    """
+    Apply a review to the question row in one UPDATE ... RETURNING (no prior SELECT),
+    so concurrent reviews of the same card cannot overwrite each other's mastery change.
+    Returns (mastery_score, next_review_at), or None if the question does not exist.
+    Does not commit; callers invalidate forecast_cache after committing.
+    """
+    Q = models.Question
+    _record_review_rollup(db, user_id, rating, now, Q.mastery_score, (Q.id == qid, Q.user_id == user_id))
+
+    delta, interval_days = REVIEW_RULES[rating]
+    stmt = (
+        update(Q)
+        .where(Q.user_id == user_id, Q.id == qid)
+        .values(
+            review_count=Q.review_count + 1,
+            mastery_score=least(greatest(Q.mastery_score + delta, 0.0), 5.0),
+            next_review_at=now + timedelta(days=interval_days),
+            last_reviewed_at=now,
+            updated_at=now,
+        )
+        .returning(Q.mastery_score, Q.next_review_at)
+        .execution_options(synchronize_session=False)
+    )
+    return db.execute(stmt).first()
 
 def _get_or_create_tags(db: Session, user_id: uuid.UUID, names: list[str]) -> list[models.Tag]:
     cleaned = []
@@ -32,7 +112,16 @@ def _get_or_create_tags(db: Session, user_id: uuid.UUID, names: list[str]) -> li
         result.append(tag)
     return result
 
-def create_question(db: Session, user_id: uuid.UUID, payload: QuestionCreate) -> models.Question:
+def _tag_refs(q: models.Question) -> list[tuple[uuid.UUID, str]]:
+    return [(t.id, t.name) for t in q.tags]
+
+def _after_write(user_id: uuid.UUID, q: models.Question, old_tags: list[tuple[uuid.UUID, str]]) -> None:
+    # Keep the in-process read indexes in step with a committed create/update.
+    related_index.upsert(user_id, q)
+    tag_index.retag(user_id, old_tags, _tag_refs(q))
+    forecast_cache.invalidate(user_id)
+
+def _new_question(db: Session, user_id: uuid.UUID, payload: QuestionCreate) -> models.Question:
     q = models.Question(
         user_id=user_id,
         question_text=payload.question_text,
@@ -43,32 +132,70 @@ def create_question(db: Session, user_id: uuid.UUID, payload: QuestionCreate) ->
     )
     q.tags = _get_or_create_tags(db, user_id, payload.tags)
     db.add(q)
+    return q
+
+def create_question(db: Session, user_id: uuid.UUID, payload: QuestionCreate) -> models.Question:
+    q = _new_question(db, user_id, payload)
     db.commit()
-    db.refresh(q)
+    _after_write(user_id, q, [])
     return q
 
-def update_question(db: Session, q: models.Question, user_id: uuid.UUID, payload: QuestionUpdate) -> models.Question:
-    if payload.question_text is not None:
-        q.question_text = payload.question_text
+def add_questions(db: Session, user_id: uuid.UUID, payloads: list[QuestionCreate]) -> None:
+    """
+    Stage many new questions in the current transaction. Does not commit; callers
+    commit and then drop the user's caches (invalidate_user_caches).
+    """
+    for payload in payloads:
+        _new_question(db, user_id, payload)
+        db.flush()  # so later rows find tags created by earlier ones
+
+def update_question(db: Session, user_id: uuid.UUID, qid: uuid.UUID, payload: QuestionUpdate) -> models.Question | None:
+    values = {
+        k: v
+        for k, v in payload.model_dump(exclude={"tags"}).items()
+        if v is not None
+    }
+    values["updated_at"] = datetime.utcnow()
     if payload.answer_md is not None:
-        q.answer_md = payload.answer_md
-    if payload.difficulty is not None:
-        q.difficulty = payload.difficulty
-    if payload.source is not None:
-        q.source = payload.source
-    if payload.is_flagged is not None:
-        q.is_flagged = payload.is_flagged
-    if payload.tags is not None:
+        values["answer_html"] = None  # re-rendered on next ?render=html read
+
+    if payload.tags is None:
+        # Column-only patch: a single UPDATE ... RETURNING instead of SELECT + UPDATE + refresh.
+        stmt = (
+            update(models.Question)
+            .where(models.Question.user_id == user_id, models.Question.id == qid)
+            .values(**values)
+            .returning(models.Question)
+        )
+        q = db.execute(stmt, execution_options={"populate_existing": True}).scalars().first()
+        if not q:
+            return None
+        db.commit()
+        old_tags = _tag_refs(q)
+    else:
+        q = get_question(db, user_id, qid)
+        if not q:
+            return None
+        old_tags = _tag_refs(q)
+        for k, v in values.items():
+            setattr(q, k, v)
         q.tags = _get_or_create_tags(db, user_id, payload.tags)
+        db.commit()
 
-    q.updated_at = datetime.utcnow()
-    db.commit()
-    db.refresh(q)
+    _after_write(user_id, q, old_tags)
     return q
 
-def list_questions(db: Session, user_id: uuid.UUID, search: str | None, tag: str | None, flagged: bool | None):
-    stmt = select(models.Question).where(models.Question.user_id == user_id)
+def delete_question(db: Session, q: models.Question, user_id: uuid.UUID) -> None:
+    qid, old_tags = q.id, _tag_refs(q)
+    subscribers = _question_subscribers(db, [qid])  # read before the cascade drops deck_questions
+    db.delete(q)
+    db.commit()
+    related_index.remove(user_id, qid)
+    tag_index.retag(user_id, old_tags, [])
+    forecast_cache.invalidate(user_id)
+    _invalidate_forecasts(subscribers)
 
+def _filter_questions(stmt, search: str | None, tag: str | None, flagged: bool | None):
     if flagged is not None:
         stmt = stmt.where(models.Question.is_flagged == flagged)
 
@@ -80,9 +207,430 @@ def list_questions(db: Session, user_id: uuid.UUID, search: str | None, tag: str
         t = tag.strip().lower()
         stmt = stmt.join(models.Question.tags).where(models.Tag.name == t)
 
+    return stmt
+
+def list_questions(db: Session, user_id: uuid.UUID, search: str | None, tag: str | None, flagged: bool | None):
+    stmt = select(models.Question).where(models.Question.user_id == user_id)
+    stmt = _filter_questions(stmt, search, tag, flagged)
     stmt = stmt.order_by(models.Question.updated_at.desc())
     return db.execute(stmt).scalars().all()
 
+def list_due_questions(
+    db: Session, user_id: uuid.UUID, now: datetime, limit: int, exclude_ids: list[uuid.UUID] | None = None
+) -> list[models.Question]:
+    stmt = select(models.Question).where(
+        models.Question.user_id == user_id,
+        models.Question.next_review_at <= now,
+    )
+    if exclude_ids:
+        stmt = stmt.where(models.Question.id.notin_(exclude_ids))
+    stmt = stmt.order_by(models.Question.next_review_at.asc()).limit(limit)
+    return db.execute(stmt).scalars().all()
+
 def get_question(db: Session, user_id: uuid.UUID, qid: uuid.UUID) -> models.Question | None:
     stmt = select(models.Question).where(models.Question.user_id == user_id, models.Question.id == qid)
     return db.execute(stmt).scalars().first()
+
+def invalidate_user_caches(user_id: uuid.UUID) -> None:
+    # Set-based writes touch many rows at once; let the indexes reload lazily.
+    related_index.invalidate(user_id)
+    tag_index.invalidate(user_id)
+    forecast_cache.invalidate(user_id)
+
+def bulk_update(db: Session, user_id: uuid.UUID, payload: BulkAction) -> int:
+    """Apply one bulk action in a single transaction. Returns the affected row count."""
+    Q = models.Question
+    target = select(Q.id).where(Q.user_id == user_id)
+    if payload.ids is not None:
+        target = target.where(Q.id.in_(payload.ids))
+    if payload.filter is not None:
+        f = payload.filter
+        target = _filter_questions(target, f.search, f.tag, f.flagged)
+    # Used as a subquery against questions/question_tags: never correlate.
+    target = target.correlate(None)
+    subscribers = []
+
+    if payload.action in ("flag", "unflag"):
+        stmt = (
+            update(Q)
+            .where(Q.id.in_(target))
+            .values(is_flagged=payload.action == "flag", updated_at=datetime.utcnow())
+            .execution_options(synchronize_session=False)
+        )
+    elif payload.action == "delete":
+        # question_tags and deck_questions rows go with ON DELETE CASCADE
+        subscribers = _question_subscribers(db, target)
+        stmt = delete(Q).where(Q.id.in_(target)).execution_options(synchronize_session=False)
+    elif payload.action == "add_tag":
+        tag = _get_or_create_tags(db, user_id, [payload.tag])[0]
+        db.flush()
+        QT = models.QuestionTag
+        other = QT.__table__.alias("other")
+        already = exists().where(other.c.question_id == Q.id, other.c.tag_id == tag.id)
+        stmt = QT.__table__.insert().from_select(
+            ["question_id", "tag_id"],
+            select(Q.id, literal(tag.id, Uuid)).where(Q.id.in_(target), ~already),
+        ).returning(QT.question_id)
+    else:
+        # Look up only: removing a tag nobody has must not create it.
+        tag = get_tag_by_name(db, user_id, payload.tag.strip().lower())
+        if tag is None:
+            return 0
+        QT = models.QuestionTag
+        stmt = (
+            delete(QT)
+            .where(QT.tag_id == tag.id, QT.question_id.in_(target))
+            .execution_options(synchronize_session=False)
+        )
+
+    result = db.execute(stmt)
+    # INSERT ... SELECT rowcount is not reported by every driver; count RETURNING rows instead.
+    affected = len(result.all()) if result.returns_rows else result.rowcount
+    db.commit()
+    invalidate_user_caches(user_id)
+    _invalidate_forecasts(subscribers)
+    return affected
+
+def _fold_rollup_tag(db: Session, user_id: uuid.UUID, source: str, target: str) -> None:
+    """Move review_daily_rollup rows from one tag name onto another, summing clashes."""
+    R = models.ReviewDailyRollup
+    rows = select(R.user_id, R.day, literal(target), R.forgot_count, R.almost_count, R.knew_count, R.mastery_delta).where(
+        R.user_id == user_id, R.tag == source
+    )
+    _add_to_rollup(db, ["user_id", "day", "tag", "forgot_count", "almost_count", "knew_count", "mastery_delta"], rows)
+    db.execute(delete(R).where(R.user_id == user_id, R.tag == source))
+
+def get_tag(db: Session, user_id: uuid.UUID, tag_id: uuid.UUID) -> models.Tag | None:
+    stmt = select(models.Tag).where(models.Tag.user_id == user_id, models.Tag.id == tag_id)
+    return db.execute(stmt).scalars().first()
+
+def get_tag_by_name(db: Session, user_id: uuid.UUID, name: str) -> models.Tag | None:
+    stmt = select(models.Tag).where(models.Tag.user_id == user_id, models.Tag.name == name)
+    return db.execute(stmt).scalars().first()
+
+def merge_tags(db: Session, user_id: uuid.UUID, source: models.Tag, target: models.Tag) -> int:
+    """Retag every question from `source` onto `target`, then drop `source`. Returns questions moved."""
+    QT = models.QuestionTag
+    other = QT.__table__.alias("other")
+    moving = select(QT.question_id, literal(target.id, Uuid)).where(
+        QT.tag_id == source.id,
+        ~exists().where(other.c.question_id == QT.question_id, other.c.tag_id == target.id),
+    )
+    moved = len(
+        db.execute(QT.__table__.insert().from_select(["question_id", "tag_id"], moving).returning(QT.question_id)).all()
+    )
+
+    # question_tags rows of the source tag go with ON DELETE CASCADE
+    db.execute(delete(models.Tag).where(models.Tag.id == source.id).execution_options(synchronize_session=False))
+    _fold_rollup_tag(db, user_id, source.name, target.name)
+    db.commit()
+    invalidate_user_caches(user_id)
+    return moved
+
+def rename_tag(db: Session, user_id: uuid.UUID, tag: models.Tag, name: str) -> models.Tag:
+    old = tag.name
+    tag.name = name
+    db.flush()
+    _fold_rollup_tag(db, user_id, old, name)
+    db.commit()
+    invalidate_user_caches(user_id)
+    return tag
+
+def count_tag_questions(db: Session, tag_id: uuid.UUID) -> int:
+    return db.execute(
+        select(func.count()).select_from(models.QuestionTag).where(models.QuestionTag.tag_id == tag_id)
+    ).scalar_one()
+
+def rendered_answers(db: Session, questions: list[models.Question]) -> dict[uuid.UUID, str]:
+    """
+    answer_html per question. Rows without a stored rendering are rendered through
+    the content-hash cache and, if RENDER_PERSIST_HTML, written back in one batch.
+    """
+    out = {}
+    missing = []
+    for q in questions:
+        html = q.answer_html
+        if html is None:
+            html = markdown_cache.render(q.answer_md)
+            missing.append({"b_id": q.id, "b_updated_at": q.updated_at, "b_html": html})
+        out[q.id] = html
+
+    if missing and settings.RENDER_PERSIST_HTML:
+        t = models.Question.__table__
+        # The updated_at guard skips rows edited since they were read.
+        stmt = (
+            update(t)
+            .where(t.c.id == bindparam("b_id"), t.c.updated_at == bindparam("b_updated_at"))
+            .values(answer_html=bindparam("b_html"))
+        )
+        db.execute(stmt, missing)
+        db.commit()
+    return out
+
+def get_questions_by_ids(db: Session, user_id: uuid.UUID, ids: list[uuid.UUID]) -> list[models.Question]:
+    if not ids:
+        return []
+    stmt = select(models.Question).where(models.Question.user_id == user_id, models.Question.id.in_(ids))
+    return db.execute(stmt).scalars().all()
+
+# -----------------------------
+# Shared decks
+# -----------------------------
+# Deck content is stored once, as the owner's question rows, and listed in
+# deck_questions. Subscribers keep only their scheduling state in deck_card_states.
+
+def _attach_to_deck(db: Session, deck: models.Deck, ids: list[uuid.UUID]) -> int:
+    if not ids:
+        return 0
+    Q, DQ = models.Question, models.DeckQuestion
+    owned = select(literal(deck.id, Uuid), Q.id, literal(datetime.utcnow(), DateTime)).where(
+        Q.user_id == deck.owner_id, Q.id.in_(ids)
+    )
+    stmt = (
+        upsert_insert(db, DQ)
+        .from_select(["deck_id", "question_id", "added_at"], owned)
+        .on_conflict_do_nothing(index_elements=[DQ.deck_id, DQ.question_id])
+        .returning(DQ.question_id)
+    )
+    return len(db.execute(stmt).all())
+
+def create_deck(db: Session, owner_id: uuid.UUID, payload: DeckCreate) -> tuple[models.Deck, int]:
+    deck = models.Deck(
+        owner_id=owner_id,
+        name=payload.name.strip(),
+        description=payload.description,
+        is_public=payload.is_public,
+    )
+    db.add(deck)
+    db.flush()
+    attached = _attach_to_deck(db, deck, payload.question_ids)
+    db.commit()
+    return deck, attached
+
+def add_deck_questions(db: Session, deck: models.Deck, ids: list[uuid.UUID]) -> int:
+    """Share the owner's questions `ids` through `deck`. Returns the number newly attached."""
+    attached = _attach_to_deck(db, deck, ids)
+    db.commit()
+    if attached:
+        _invalidate_subscribers(db, deck.id)
+    return attached
+
+def remove_deck_question(db: Session, deck: models.Deck, qid: uuid.UUID) -> bool:
+    DQ = models.DeckQuestion
+    removed = db.execute(delete(DQ).where(DQ.deck_id == deck.id, DQ.question_id == qid)).rowcount
+    _drop_orphaned_states(db, [qid])
+    db.commit()
+    if removed:
+        _invalidate_subscribers(db, deck.id)
+    return removed > 0
+
+def _invalidate_subscribers(db: Session, deck_id: uuid.UUID) -> None:
+    DS = models.DeckSubscription
+    _invalidate_forecasts(db.execute(select(DS.user_id).where(DS.deck_id == deck_id)).scalars().all())
+
+def _question_subscribers(db: Session, qids) -> list[uuid.UUID]:
+    """Users subscribed to a deck holding any of `qids` (a list or an id subquery)."""
+    DS, DQ = models.DeckSubscription, models.DeckQuestion
+    stmt = select(DS.user_id).join(DQ, DQ.deck_id == DS.deck_id).where(DQ.question_id.in_(qids)).distinct()
+    return db.execute(stmt).scalars().all()
+
+def _invalidate_forecasts(user_ids) -> None:
+    # Subscribers' due forecasts include their decks' cards.
+    for user_id in user_ids:
+        forecast_cache.invalidate(user_id)
+
+def _drop_orphaned_states(db: Session, qids) -> None:
+    # Subscriber state for questions that are no longer in any deck.
+    S, DQ = models.DeckCardState, models.DeckQuestion
+    db.execute(
+        delete(S)
+        .where(S.question_id.in_(qids), ~exists().where(DQ.question_id == S.question_id))
+        .execution_options(synchronize_session=False)
+    )
+
+def get_deck(db: Session, deck_id: uuid.UUID) -> models.Deck | None:
+    return db.get(models.Deck, deck_id)
+
+def list_decks(db: Session, user_id: uuid.UUID) -> list[tuple[models.Deck, int, bool]]:
+    """Public, owned and subscribed decks as (deck, question_count, subscribed)."""
+    D, DQ, DS = models.Deck, models.DeckQuestion, models.DeckSubscription
+    counts = select(DQ.deck_id, func.count().label("n")).group_by(DQ.deck_id).subquery()
+    subscribed = exists().where(DS.user_id == user_id, DS.deck_id == D.id)
+    stmt = (
+        select(D, func.coalesce(counts.c.n, 0), subscribed)
+        .outerjoin(counts, counts.c.deck_id == D.id)
+        .where(or_(D.is_public, D.owner_id == user_id, subscribed))
+        .order_by(D.created_at.desc())
+    )
+    return [tuple(row) for row in db.execute(stmt).all()]
+
+def count_deck_questions(db: Session, deck_id: uuid.UUID) -> int:
+    DQ = models.DeckQuestion
+    return db.execute(select(func.count()).select_from(DQ).where(DQ.deck_id == deck_id)).scalar_one()
+
+def is_subscribed(db: Session, user_id: uuid.UUID, deck_id: uuid.UUID) -> bool:
+    return db.get(models.DeckSubscription, (user_id, deck_id)) is not None
+
+def subscribe(db: Session, user_id: uuid.UUID, deck_id: uuid.UUID) -> None:
+    # One row per subscriber, whatever the deck size.
+    DS = models.DeckSubscription
+    stmt = upsert_insert(db, DS).values(user_id=user_id, deck_id=deck_id, created_at=datetime.utcnow())
+    db.execute(stmt.on_conflict_do_nothing(index_elements=[DS.user_id, DS.deck_id]))
+    db.commit()
+    forecast_cache.invalidate(user_id)
+
+def unsubscribe(db: Session, user_id: uuid.UUID, deck_id: uuid.UUID) -> None:
+    # deck_card_states rows are kept, so re-subscribing restores progress.
+    DS = models.DeckSubscription
+    db.execute(delete(DS).where(DS.user_id == user_id, DS.deck_id == deck_id))
+    db.commit()
+    forecast_cache.invalidate(user_id)
+
+def delete_deck(db: Session, deck: models.Deck) -> None:
+    """Drop the deck; its questions stay with the owner as ordinary questions."""
+    DQ = models.DeckQuestion
+    qids = db.execute(select(DQ.question_id).where(DQ.deck_id == deck.id)).scalars().all()
+    _invalidate_subscribers(db, deck.id)
+    # deck_questions and subscriptions go with ON DELETE CASCADE
+    db.execute(delete(models.Deck).where(models.Deck.id == deck.id))
+    if qids:
+        _drop_orphaned_states(db, qids)
+    db.commit()
+
+def _deck_cards(user_id: uuid.UUID, deck: models.Deck):
+    Q, DQ = models.Question, models.DeckQuestion
+    in_deck = exists().where(DQ.deck_id == deck.id, DQ.question_id == Q.id)
+    if user_id == deck.owner_id:
+        # The owner's state lives on the question rows themselves.
+        return select(Q, null()).where(in_deck)
+    return overlay.with_state(user_id).where(in_deck)
+
+def list_deck_cards(
+    db: Session, user_id: uuid.UUID, deck: models.Deck, due_at: datetime | None = None
+) -> list[tuple[models.Question, models.DeckCardState | None]]:
+    """Deck questions with the caller's state (None = never reviewed); forked cards are left out."""
+    Q, S = models.Question, models.DeckCardState
+    stmt = _deck_cards(user_id, deck)
+    if due_at is not None:
+        if user_id == deck.owner_id:
+            stmt = stmt.where(Q.next_review_at <= due_at)
+        else:
+            stmt = stmt.where(or_(S.next_review_at.is_(None), S.next_review_at <= due_at))
+    stmt = stmt.order_by(Q.created_at.asc())
+    return [tuple(row) for row in db.execute(stmt).all()]
+
+def get_deck_card(
+    db: Session, user_id: uuid.UUID, deck: models.Deck, qid: uuid.UUID
+) -> tuple[models.Question, models.DeckCardState | None] | None:
+    row = db.execute(_deck_cards(user_id, deck).where(models.Question.id == qid)).first()
+    return tuple(row) if row else None
+
+def list_subscribed_due(
+    db: Session,
+    user_id: uuid.UUID,
+    now: datetime,
+    limit: int | None = None,
+    exclude_ids: list[uuid.UUID] | None = None,
+    search: str | None = None,
+    tag: str | None = None,
+) -> list[tuple[models.Question, models.DeckCardState | None]]:
+    """Due cards from decks the user subscribes to, with the user's state, most overdue first."""
+    stmt = overlay.with_state(user_id).where(overlay.in_subscribed_deck(user_id), overlay.is_due(now))
+    stmt = _filter_questions(stmt, search, tag, None)
+    if exclude_ids:
+        stmt = stmt.where(models.Question.id.notin_(exclude_ids))
+    stmt = stmt.order_by(overlay.next_review_at().asc(), models.Question.id).limit(limit)
+    return [tuple(row) for row in db.execute(stmt).all()]
+
+def get_subscribed_card(
+    db: Session, user_id: uuid.UUID, qid: uuid.UUID
+) -> tuple[models.Question, models.DeckCardState | None] | None:
+    stmt = overlay.with_state(user_id).where(overlay.in_subscribed_deck(user_id), models.Question.id == qid)
+    row = db.execute(stmt).first()
+    return tuple(row) if row else None
+
+def review_deck_card(db: Session, user_id: uuid.UUID, qid: uuid.UUID, rating: str, now: datetime):
+    """
+    Subscriber counterpart of review_question: one upsert ... RETURNING on the
+    caller's deck_card_states row. Returns (mastery_score, next_review_at).
+    Does not commit.
+    """
+    Q, S = models.Question, models.DeckCardState
+    current = (
+        select(S.mastery_score).where(S.user_id == user_id, S.question_id == Q.id).correlate(Q).scalar_subquery()
+    )
+    _record_review_rollup(db, user_id, rating, now, func.coalesce(current, 0.0), (Q.id == qid,))
+
+    delta, _ = REVIEW_RULES[rating]
+    first_mastery, next_review_at = schedule_review(0.0, rating, now)
+    stmt = upsert_insert(db, S).values(
+        user_id=user_id,
+        question_id=qid,
+        review_count=1,
+        mastery_score=first_mastery,
+        next_review_at=next_review_at,
+        updated_at=now,
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[S.user_id, S.question_id],
+        set_={
+            "review_count": S.review_count + 1,
+            "mastery_score": least(greatest(S.mastery_score + delta, 0.0), 5.0),
+            "next_review_at": stmt.excluded.next_review_at,
+            "updated_at": stmt.excluded.updated_at,
+        },
+    ).returning(S.mastery_score, S.next_review_at)
+    return db.execute(stmt).first()
+
+def fork_deck_card(
+    db: Session,
+    user_id: uuid.UUID,
+    q: models.Question,
+    state: models.DeckCardState | None,
+    payload: QuestionUpdate,
+) -> models.Question:
+    """
+    Copy-on-write edit of a shared card: create the subscriber's private question
+    with `payload` applied and their scheduling state carried over, and hide the
+    shared card for them from now on.
+    """
+    now = datetime.utcnow()
+    values = {k: v for k, v in payload.model_dump(exclude={"tags"}).items() if v is not None}
+    copy = models.Question(
+        user_id=user_id,
+        question_text=values.get("question_text", q.question_text),
+        answer_md=values.get("answer_md", q.answer_md),
+        answer_html=None if "answer_md" in values else q.answer_html,
+        difficulty=values.get("difficulty", q.difficulty),
+        source=values.get("source", q.source),
+        is_flagged=values.get("is_flagged", False),
+        updated_at=now,
+        review_count=state.review_count if state else 0,
+        mastery_score=state.mastery_score if state else 0.0,
+        next_review_at=state.next_review_at if state else now,
+        last_reviewed_at=state.updated_at if state and state.review_count else None,
+    )
+    names = payload.tags if payload.tags is not None else [t.name for t in q.tags]
+    copy.tags = _get_or_create_tags(db, user_id, names)
+    db.add(copy)
+    db.flush()
+
+    S = models.DeckCardState
+    stmt = upsert_insert(db, S).values(
+        user_id=user_id,
+        question_id=q.id,
+        review_count=copy.review_count,
+        mastery_score=copy.mastery_score,
+        next_review_at=copy.next_review_at,
+        updated_at=now,
+        forked_question_id=copy.id,
+    )
+    db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[S.user_id, S.question_id],
+            set_={"forked_question_id": stmt.excluded.forked_question_id, "updated_at": now},
+        )
+    )
+    db.commit()
+    _after_write(user_id, copy, [])
+    return copy
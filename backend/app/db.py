@@ -1,9 +1,46 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker, DeclarativeBase
+from sqlalchemy.pool import StaticPool
 from .settings import settings
 
-engine = create_engine(settings.DATABASE_URL, pool_pre_ping=True)
-SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+IS_SQLITE = settings.DATABASE_URL.startswith("sqlite")
+
+# sqlite:// and :memory: databases live inside one connection, so every thread
+# has to share it; there is no file for WAL or mmap to act on.
+IS_SQLITE_MEMORY = IS_SQLITE and (
+    settings.DATABASE_URL in ("sqlite://", "sqlite+pysqlite://") or ":memory:" in settings.DATABASE_URL
+)
+
+if IS_SQLITE:
+    # Embedded single-node mode, e.g. DATABASE_URL=sqlite:///./qbank.db
+    engine = create_engine(
+        settings.DATABASE_URL,
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool if IS_SQLITE_MEMORY else None,
+    )
+
+    @event.listens_for(engine, "connect")
+    def _sqlite_pragmas(dbapi_conn, _record):
+        cur = dbapi_conn.cursor()
+        if not IS_SQLITE_MEMORY:
+            cur.execute("PRAGMA journal_mode=WAL")  # readers don't block the writer
+            cur.execute("PRAGMA synchronous=NORMAL")  # durable at checkpoints; safe with WAL
+            cur.execute(f"PRAGMA mmap_size={settings.SQLITE_MMAP_BYTES}")
+        cur.execute("PRAGMA foreign_keys=ON")  # needed for ON DELETE CASCADE
+        cur.execute(f"PRAGMA busy_timeout={settings.SQLITE_BUSY_TIMEOUT_MS}")
+        cur.execute("PRAGMA temp_store=MEMORY")
+        cur.execute(f"PRAGMA cache_size=-{settings.SQLITE_CACHE_KB}")
+        cur.close()
+else:
+    engine = create_engine(
+        settings.DATABASE_URL,
+        pool_pre_ping=True,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+    )
+# expire_on_commit=False: objects stay usable after commit, so write paths can
+# build their response without a refresh SELECT.
+SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, expire_on_commit=False)
 
 class Base(DeclarativeBase):
     pass
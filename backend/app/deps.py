@@ -8,11 +8,7 @@ from .auth import decode_token
 from .models import User
 
 
-def get_current_user(
-    request: Request,
-    db: Session = Depends(get_db),
-) -> User:
-    token = request.cookies.get("access_token")
+def user_from_token(db: Session, token: str | None) -> User:
     if not token:
         raise HTTPException(status_code=401, detail="Not authenticated")
 
@@ -27,3 +23,10 @@ def get_current_user(
         raise HTTPException(status_code=401, detail="User not found")
 
     return user
+
+
+def get_current_user(
+    request: Request,
+    db: Session = Depends(get_db),
+) -> User:
+    return user_from_token(db, request.cookies.get("access_token"))
@@ -0,0 +1,148 @@
+import gzip
+import threading
+import time
+
+from fastapi.responses import ORJSONResponse
+
+
+class EncodingStats:
+    """Counters for JSON encoding and response compression, served by /metrics."""
+
+    def __init__(self):
+        self.encoded = 0
+        self.encode_seconds = 0.0
+        self.encoded_bytes = 0
+        self.compressed = 0
+        self.compress_seconds = 0.0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self._lock = threading.Lock()
+
+    def record_encode(self, seconds: float, size: int) -> None:
+        with self._lock:
+            self.encoded += 1
+            self.encode_seconds += seconds
+            self.encoded_bytes += size
+
+    def record_compress(self, seconds: float, size_in: int, size_out: int) -> None:
+        with self._lock:
+            self.compressed += 1
+            self.compress_seconds += seconds
+            self.bytes_in += size_in
+            self.bytes_out += size_out
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "json": {
+                    "responses": self.encoded,
+                    "bytes": self.encoded_bytes,
+                    "encode_ms_total": round(self.encode_seconds * 1000, 3),
+                    "encode_ms_avg": round(self.encode_seconds * 1000 / self.encoded, 4) if self.encoded else 0.0,
+                },
+                "gzip": {
+                    "responses": self.compressed,
+                    "bytes_in": self.bytes_in,
+                    "bytes_out": self.bytes_out,
+                    "bytes_saved": self.bytes_in - self.bytes_out,
+                    "compress_ms_total": round(self.compress_seconds * 1000, 3),
+                },
+            }
+
+
+encoding_stats = EncodingStats()
+
+
+class FastJSONResponse(ORJSONResponse):
+    """App-wide default response class: orjson straight to bytes, timed."""
+
+    def render(self, content) -> bytes:
+        start = time.perf_counter()
+        body = super().render(content)
+        encoding_stats.record_encode(time.perf_counter() - start, len(body))
+        return body
+
+
+def accepts_gzip(accept_encoding: str) -> bool:
+    wildcard = False
+    for item in accept_encoding.split(","):
+        coding, _, params = item.partition(";")
+        coding = coding.strip().lower()
+        if coding not in ("gzip", "*"):
+            continue
+        q = 1.0
+        params = params.strip().lower()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        if coding == "gzip":
+            return q > 0
+        wildcard = q > 0
+    return wildcard
+
+
+_COMPRESSIBLE = (b"application/json", b"text/")
+
+
+class CompressionMiddleware:
+    """
+    gzip for complete (non-streaming) responses of at least `min_size` bytes when
+    the request's Accept-Encoding allows it. Streaming bodies pass through as-is.
+    """
+
+    def __init__(self, app, min_size: int, level: int):
+        self.app = app
+        self.min_size = min_size
+        self.level = level
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or self.min_size <= 0:
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope["headers"])
+        if not accepts_gzip(headers.get(b"accept-encoding", b"").decode("latin-1")):
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+
+        async def send_compressed(message):
+            nonlocal start_message
+            if message["type"] == "http.response.start":
+                start_message = message  # held until we see the body
+                return
+            if start_message is None:
+                await send(message)
+                return
+
+            start, start_message = start_message, None
+            body = message.get("body", b"")
+            resp_headers = dict(start["headers"])
+            if (
+                message.get("more_body", False)
+                or len(body) < self.min_size
+                or b"content-encoding" in resp_headers
+                or not resp_headers.get(b"content-type", b"").startswith(_COMPRESSIBLE)
+            ):
+                await send(start)
+                await send(message)
+                return
+
+            t0 = time.perf_counter()
+            compressed = gzip.compress(body, compresslevel=self.level, mtime=0)
+            encoding_stats.record_compress(time.perf_counter() - t0, len(body), len(compressed))
+
+            raw = [(k, v) for k, v in start["headers"] if k not in (b"content-length", b"vary")]
+            vary = resp_headers.get(b"vary")
+            raw += [
+                (b"content-encoding", b"gzip"),
+                (b"content-length", str(len(compressed)).encode()),
+                (b"vary", vary + b", Accept-Encoding" if vary else b"Accept-Encoding"),
+            ]
+            await send({**start, "headers": raw})
+            await send({**message, "body": compressed})
+
+        await self.app(scope, receive, send_compressed)
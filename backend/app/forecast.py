@@ -0,0 +1,145 @@
+import uuid
+from datetime import date, datetime, timedelta
+
+import numpy as np
+from sqlalchemy import func, literal, select, union_all
+from sqlalchemy.orm import Session
+
+from . import models, overlay
+from .lru import UserLRU
+from .scheduling import REVIEW_RULES
+from .settings import settings
+from .sqlcompat import day_start
+
+RATINGS = list(REVIEW_RULES)  # forgot, almost, knew
+_FIRST_RATING = RATINGS.index("almost")  # assumed first rating of never-reviewed cards
+
+
+# -----------------------------
+# Due counts (cached per user)
+# -----------------------------
+class ForecastCache:
+    """Per-user forecast results, dropped on the user's next review or edit."""
+
+    def __init__(self, max_users: int):
+        self._users: UserLRU[dict] = UserLRU(max_users)
+
+    def get(self, user_id: uuid.UUID, key):
+        entries = self._users.get(user_id)
+        return None if entries is None else entries.get(key)
+
+    def put(self, user_id: uuid.UUID, key, value) -> None:
+        self._users.setdefault(user_id, dict)[key] = value
+
+    def invalidate(self, user_id: uuid.UUID) -> None:
+        self._users.pop(user_id)
+
+
+forecast_cache = ForecastCache(max_users=settings.FORECAST_CACHE_USERS)
+
+
+def due_counts(db: Session, user_id: uuid.UUID, today: date, days: int) -> dict:
+    """
+    Due cards per day over [today, today + days), overall ("" key) and per tag,
+    in one statement (GROUP BY day) over the (user_id, next_review_at) index range.
+    Cards already overdue are counted on today and reported as `overdue`.
+    """
+    cached = forecast_cache.get(user_id, (today, days))
+    if cached is not None:
+        return cached
+
+    Q = models.Question
+    day = day_start(Q.next_review_at).label("day")
+    horizon = datetime.combine(today + timedelta(days=days), datetime.min.time())
+    in_range = (Q.user_id == user_id, Q.next_review_at < horizon)
+    overall = select(day, literal("").label("tag"), func.count().label("n")).where(*in_range).group_by(day)
+    per_tag = (
+        select(day, models.Tag.name, func.count())
+        .join(models.QuestionTag, models.QuestionTag.question_id == Q.id)
+        .join(models.Tag, models.Tag.id == models.QuestionTag.tag_id)
+        .where(*in_range)
+        .group_by(day, models.Tag.name)
+    )
+
+    # Cards from subscribed decks, scheduled by the user's own deck_card_states.
+    shared_day = day_start(overlay.next_review_at()).label("day")
+    shared_range = (overlay.in_subscribed_deck(user_id), overlay.next_review_at() < horizon)
+    shared_overall = (
+        overlay.with_state(user_id, shared_day, literal(""), func.count()).where(*shared_range).group_by(shared_day)
+    )
+    shared_per_tag = (
+        overlay.with_state(user_id, shared_day, models.Tag.name, func.count())
+        .join(models.QuestionTag, models.QuestionTag.question_id == Q.id)
+        .join(models.Tag, models.Tag.id == models.QuestionTag.tag_id)
+        .where(*shared_range)
+        .group_by(shared_day, models.Tag.name)
+    )
+
+    series: dict[str, list[int]] = {"": [0] * days}
+    overdue = 0
+    for d, tag, n in db.execute(union_all(overall, per_tag, shared_overall, shared_per_tag)).all():
+        offset = (d.date() - today).days
+        if offset < 0:
+            if tag == "":
+                overdue += n
+            offset = 0
+        series.setdefault(tag, [0] * days)[offset] += n
+
+    result = {"series": series, "overdue": overdue}
+    forecast_cache.put(user_id, (today, days), result)
+    return result
+
+
+# -----------------------------
+# What-if projection (read-only)
+# -----------------------------
+def _infer_ratings(next_review_at: np.ndarray, last_reviewed_at: np.ndarray, reviewed: np.ndarray) -> np.ndarray:
+    # The last interval (next_review_at - last review) tells which rating scheduled the card.
+    current = np.array([REVIEW_RULES[r][1] for r in RATINGS], dtype=np.float64)
+    last_interval = (next_review_at - last_reviewed_at) / np.timedelta64(1, "D")
+    ratings = np.abs(last_interval[:, None] - current[None, :]).argmin(axis=1)
+    ratings[~reviewed] = _FIRST_RATING
+    return ratings
+
+
+def _project(first_due: np.ndarray, step: np.ndarray, days: int) -> list[int]:
+    """Reviews per day if every card is reviewed when due and keeps its rating."""
+    if first_due.size == 0:
+        return [0] * days
+    k = np.arange(days // max(int(step.min()), 1) + 1)
+    occ = first_due[:, None] + k[None, :] * step[:, None]
+    return np.bincount(occ[occ < days], minlength=days).tolist()
+
+
+def what_if(db: Session, user_id: uuid.UUID, today: date, days: int, intervals: list[int]) -> dict:
+    """
+    Project daily review load under `intervals` (days after forgot/almost/knew)
+    against the current policy. Nothing is written.
+    """
+    Q = models.Question
+    rows = db.execute(
+        select(Q.next_review_at, func.coalesce(Q.last_reviewed_at, Q.next_review_at)).where(Q.user_id == user_id)
+    ).all()
+    if not rows:
+        return {"intervals": intervals, "baseline": [0] * days, "projected": [0] * days}
+
+    next_at, last = (np.array(c, dtype="datetime64[s]") for c in zip(*rows))
+    reviewed = last != next_at  # coalesce(): never-reviewed cards report next_review_at
+    start = np.datetime64(today, "s")
+
+    ratings = _infer_ratings(next_at, last, reviewed)
+    current = np.array([REVIEW_RULES[r][1] for r in RATINGS], dtype=np.int64)[ratings]
+    proposed = np.array(intervals, dtype=np.int64)[ratings]
+
+    def first_due(due_at):
+        return np.maximum((due_at - start) // np.timedelta64(1, "D"), 0).astype(np.int64)
+
+    # Reviewed cards get rescheduled from their last review under the new policy;
+    # never-reviewed cards are due already under either policy.
+    shifted = np.where(reviewed, last + proposed.astype("timedelta64[D]"), next_at)
+
+    return {
+        "intervals": intervals,
+        "baseline": _project(first_due(next_at), current, days),
+        "projected": _project(first_due(shifted), proposed, days),
+    }
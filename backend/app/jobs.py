@@ -0,0 +1,208 @@
+import logging
+import os
+import socket
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Callable
+
+from sqlalchemy import or_, select, update
+from sqlalchemy.orm import Session
+
+from . import crud, models
+from .db import SessionLocal
+from .forecast import forecast_cache
+from .related import related_index
+from .schemas import QuestionCreate
+from .settings import settings
+from .tag_index import tag_index
+
+log = logging.getLogger(__name__)
+
+Progress = Callable[[float], None]
+
+_CHUNK = 200
+# A running job is taken over once its worker misses this many heartbeats.
+_MISSED_HEARTBEATS = 3
+
+
+# -----------------------------
+# Job kinds
+# -----------------------------
+def _import(db: Session, job: models.Job, progress: Progress) -> dict:
+    items = [QuestionCreate(**item) for item in job.params.get("questions", [])]
+    # The cursor is committed together with each chunk, so a job resumed after a
+    # restart skips what it already imported. params itself is never rewritten.
+    for start in range(job.cursor, len(items), _CHUNK):
+        chunk = items[start:start + _CHUNK]
+        crud.add_questions(db, job.user_id, chunk)
+        job.cursor = start + len(chunk)
+        db.commit()
+        progress((start + len(chunk)) / len(items))
+    crud.invalidate_user_caches(job.user_id)
+    return {"imported": len(items)}
+
+
+def _export(db: Session, job: models.Job, progress: Progress) -> dict:
+    items = crud.list_questions(db, job.user_id, None, None, None)
+    return {
+        "questions": [
+            {
+                "question_text": q.question_text,
+                "answer_md": q.answer_md,
+                "difficulty": q.difficulty,
+                "source": q.source,
+                "tags": [t.name for t in q.tags],
+            }
+            for q in items
+        ]
+    }
+
+
+def _reindex(db: Session, job: models.Job, progress: Progress) -> dict:
+    forecast_cache.invalidate(job.user_id)
+    tags = tag_index.warm(db, job.user_id)
+    progress(0.5)
+    questions = related_index.warm(db, job.user_id)
+    return {"tags": tags, "questions": questions}
+
+
+def _reschedule(db: Session, job: models.Job, progress: Progress) -> dict:
+    """Spread overdue cards evenly over the next `days` days (default 7)."""
+    days = max(1, int(job.params.get("days", 7)))
+    now = datetime.utcnow()
+    Q = models.Question
+    rows = db.execute(
+        select(Q.id, Q.next_review_at, Q.last_reviewed_at)
+        .where(Q.user_id == job.user_id, Q.next_review_at <= now)
+        .order_by(Q.next_review_at.asc())
+    ).all()
+
+    def moved(i: int, next_at: datetime, last_at: datetime | None) -> dict:
+        # last_reviewed_at moves by the same amount, so next_review_at - last_reviewed_at
+        # (what the forecast's what-if reads the last rating from) is kept.
+        new_next = now + timedelta(days=i % days)
+        return {"next_review_at": new_next, "last_reviewed_at": last_at and last_at + (new_next - next_at)}
+
+    for start in range(0, len(rows), _CHUNK):
+        chunk = rows[start:start + _CHUNK]
+        db.execute(
+            update(Q),
+            [{"id": qid, **moved(start + i, next_at, last_at)} for i, (qid, next_at, last_at) in enumerate(chunk)],
+        )
+        db.commit()
+        progress((start + len(chunk)) / len(rows))
+
+    forecast_cache.invalidate(job.user_id)
+    return {"rescheduled": len(rows), "days": days}
+
+
+HANDLERS: dict[str, Callable[[Session, models.Job, Progress], dict]] = {
+    "import": _import,
+    "export": _export,
+    "reindex": _reindex,
+    "reschedule": _reschedule,
+}
+
+
+# -----------------------------
+# Runner
+# -----------------------------
+class JobRunner:
+    """
+    In-process worker pool over the jobs table. Several API processes can share
+    the table: each running job records the process that claimed it, and that
+    process keeps heartbeat_at fresh. Only jobs whose worker stopped heartbeating
+    are taken over.
+    """
+
+    def __init__(self, concurrency: int, heartbeat: float):
+        self.concurrency = concurrency
+        self.heartbeat = heartbeat
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._pool: ThreadPoolExecutor | None = None
+        self._stop = threading.Event()
+        self._beat: threading.Thread | None = None
+
+    def start(self) -> None:
+        self._pool = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="job")
+        self._stop.clear()
+        self._recover()
+        self._beat = threading.Thread(target=self._heartbeat_loop, name="job-heartbeat", daemon=True)
+        self._beat.start()
+
+    def shutdown(self) -> None:
+        self._stop.set()
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def submit(self, job_id: uuid.UUID) -> None:
+        # Without a pool (e.g. lifespan not run) the job stays queued until a runner picks it up.
+        if self._pool is not None:
+            self._pool.submit(self._run, job_id)
+
+    def _recover(self) -> None:
+        """Requeue jobs whose worker died, then submit everything queued (claims are atomic)."""
+        J = models.Job
+        stale = datetime.utcnow() - timedelta(seconds=self.heartbeat * _MISSED_HEARTBEATS)
+        with SessionLocal() as db:
+            db.execute(
+                update(J)
+                .where(J.status == "running", or_(J.heartbeat_at.is_(None), J.heartbeat_at < stale))
+                .values(status="queued", worker_id=None, heartbeat_at=None)
+            )
+            db.commit()
+            queued = db.execute(select(J.id).where(J.status == "queued").order_by(J.created_at.asc())).scalars().all()
+        for job_id in queued:
+            self.submit(job_id)
+
+    def _heartbeat_loop(self) -> None:
+        J = models.Job
+        while not self._stop.wait(self.heartbeat):
+            try:
+                with SessionLocal() as db:
+                    db.execute(
+                        update(J)
+                        .where(J.status == "running", J.worker_id == self.worker_id)
+                        .values(heartbeat_at=datetime.utcnow())
+                    )
+                    db.commit()
+                self._recover()
+            except Exception:
+                log.exception("job heartbeat failed")
+
+    def _set(self, job_id: uuid.UUID, **values) -> None:
+        # Guarded on worker_id: a job taken over by another process is no longer ours to update.
+        J = models.Job
+        with SessionLocal() as db:
+            db.execute(update(J).where(J.id == job_id, J.worker_id == self.worker_id).values(**values))
+            db.commit()
+
+    def _run(self, job_id: uuid.UUID) -> None:
+        with SessionLocal() as db:
+            # Claim atomically so a job is never run twice.
+            now = datetime.utcnow()
+            job = db.execute(
+                update(models.Job)
+                .where(models.Job.id == job_id, models.Job.status == "queued")
+                .values(status="running", started_at=now, worker_id=self.worker_id, heartbeat_at=now)
+                .returning(models.Job)
+            ).scalars().first()
+            db.commit()
+            if job is None:
+                return
+
+            try:
+                result = HANDLERS[job.kind](db, job, lambda p: self._set(job_id, progress=min(1.0, p)))
+            except Exception as e:
+                log.exception("job %s (%s) failed", job_id, job.kind)
+                db.rollback()
+                self._set(job_id, status="failed", error=str(e) or type(e).__name__, finished_at=datetime.utcnow())
+                return
+
+        self._set(job_id, status="succeeded", progress=1.0, result=result, finished_at=datetime.utcnow())
+
+
+job_runner = JobRunner(concurrency=settings.JOBS_CONCURRENCY, heartbeat=settings.JOBS_HEARTBEAT_SECONDS)
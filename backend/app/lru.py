@@ -0,0 +1,45 @@
+import threading
+import uuid
+from collections import OrderedDict
+from typing import Callable, Generic, TypeVar
+
+T = TypeVar("T")
+
+
+class UserLRU(Generic[T]):
+    """Thread-safe map of user id -> value, evicting the least recently used user."""
+
+    def __init__(self, max_users: int):
+        self.max_users = max_users
+        self._users: OrderedDict[uuid.UUID, T] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id: uuid.UUID) -> T | None:
+        with self._lock:
+            value = self._users.get(user_id)
+            if value is not None:
+                self._users.move_to_end(user_id)
+            return value
+
+    def put(self, user_id: uuid.UUID, value: T) -> T:
+        with self._lock:
+            self._users[user_id] = value
+            self._evict(user_id)
+        return value
+
+    def setdefault(self, user_id: uuid.UUID, factory: Callable[[], T]) -> T:
+        with self._lock:
+            value = self._users.get(user_id)
+            if value is None:
+                value = self._users[user_id] = factory()
+            self._evict(user_id)
+            return value
+
+    def pop(self, user_id: uuid.UUID) -> None:
+        with self._lock:
+            self._users.pop(user_id, None)
+
+    def _evict(self, user_id: uuid.UUID) -> None:
+        self._users.move_to_end(user_id)
+        while len(self._users) > self.max_users:
+            self._users.popitem(last=False)
@@ -1,12 +1,41 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from .settings import settings
+from .admission import AdmissionMiddleware, admission_groups, check_pool_budget
+from .db import IS_SQLITE
+from .encoding import CompressionMiddleware, FastJSONResponse, encoding_stats
+from .jobs import job_runner
 from .routes.questions import router as questions_router
 from .routes.auth import router as auth_router
 from .routes.dashboard import router as dashboard_router
+from .routes.study import router as study_router
+from .routes.tags import router as tags_router
+from .routes.jobs import router as jobs_router
+from .routes.decks import router as decks_router
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if not IS_SQLITE:
+        check_pool_budget(admission_groups, settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW, settings.JOBS_CONCURRENCY)
+    job_runner.start()  # also resumes jobs queued before a restart
+    yield
+    job_runner.shutdown()
 
-app = FastAPI(title="Interview QBank API", version="0.1.0")
 
+app = FastAPI(
+    title="Interview QBank API",
+    version="0.1.0",
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse,
+)
+
+# Innermost: compresses the app's responses, not admission 503s.
+app.add_middleware(CompressionMiddleware, min_size=settings.GZIP_MIN_SIZE, level=settings.GZIP_LEVEL)
+# Added before CORS so CORS stays outermost and 503s still carry CORS headers.
+app.add_middleware(AdmissionMiddleware, groups=admission_groups)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.cors_list(),
@@ -18,7 +47,18 @@ app.add_middleware(
 app.include_router(questions_router)
 app.include_router(auth_router)
 app.include_router(dashboard_router)
+app.include_router(study_router)
+app.include_router(tags_router)
+app.include_router(jobs_router)
+app.include_router(decks_router)
 
 @app.get("/health")
 def health():
     return {"ok": True}
+
+@app.get("/metrics")
+def metrics():
+    return {
+        "admission": {name: g.snapshot() for name, g in admission_groups.items()},
+        "encoding": encoding_stats.snapshot(),
+    }
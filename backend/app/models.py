@@ -1,15 +1,19 @@
 import uuid
-from datetime import datetime
+from datetime import date, datetime
 
 from sqlalchemy import (
     String,
     Text,
     Integer,
     DateTime,
+    Date,
     Boolean,
     ForeignKey,
     UniqueConstraint,
     Float,
+    Index,
+    JSON,
+    text,
 )
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -18,12 +22,15 @@ from .db import Base
 
 class Question(Base):
     __tablename__ = "questions"
+    __table_args__ = (Index("ix_questions_user_next_review", "user_id", "next_review_at"),)
 
     id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid.uuid4)
     user_id: Mapped[uuid.UUID] = mapped_column(index=True)
 
     question_text: Mapped[str] = mapped_column(Text, nullable=False)
     answer_md: Mapped[str] = mapped_column(Text, nullable=False, default="")
+    # Rendered answer_md, filled lazily on first ?render=html read; NULL = not rendered yet
+    answer_html: Mapped[str | None] = mapped_column(Text, nullable=True)
 
     difficulty: Mapped[int] = mapped_column(Integer, default=3)
     source: Mapped[str] = mapped_column(String(300), default="")
@@ -35,6 +42,8 @@ class Question(Base):
     review_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
     mastery_score: Mapped[float] = mapped_column(Float, default=0.0, nullable=False)
     next_review_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+    # Written by reviews only (updated_at also moves on edits); NULL = never reviewed
+    last_reviewed_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
 
     tags: Mapped[list["Tag"]] = relationship(
         secondary="question_tags",
@@ -76,4 +85,110 @@ class User(Base):
     id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid.uuid4)
     email: Mapped[str] = mapped_column(String(320), unique=True, index=True, nullable=False)
     password_hash: Mapped[str] = mapped_column(String(255), nullable=False)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
\ No newline at end of file
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+
+class ReviewDailyRollup(Base):
+    """Per-user, per-day review counters, maintained on every review."""
+
+    __tablename__ = "review_daily_rollup"
+
+    user_id: Mapped[uuid.UUID] = mapped_column(primary_key=True)
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    # "" = all reviews that day; otherwise one row per tag on the reviewed question
+    tag: Mapped[str] = mapped_column(String(50), primary_key=True, default="")
+
+    forgot_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    almost_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    knew_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    mastery_delta: Mapped[float] = mapped_column(Float, default=0.0, nullable=False)
+
+
+class Job(Base):
+    """Background maintenance job; see app/jobs.py."""
+
+    __tablename__ = "jobs"
+    __table_args__ = (
+        # At most one queued/running job per user.
+        Index(
+            "uq_jobs_user_active",
+            "user_id",
+            unique=True,
+            postgresql_where=text("status IN ('queued', 'running')"),
+            sqlite_where=text("status IN ('queued', 'running')"),
+        ),
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid.uuid4)
+    user_id: Mapped[uuid.UUID] = mapped_column(index=True)
+    kind: Mapped[str] = mapped_column(String(50), nullable=False)
+    status: Mapped[str] = mapped_column(String(20), nullable=False, default="queued")  # queued/running/succeeded/failed
+    params: Mapped[dict] = mapped_column(JSON, nullable=False, default=dict)
+    progress: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    result: Mapped[dict | None] = mapped_column(JSON, nullable=True)
+    error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    # Resume point for jobs that work through params in chunks (rows already done).
+    cursor: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    # Process running the job and its last sign of life; see JobRunner.
+    worker_id: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    heartbeat_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    started_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    finished_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+
+
+class Deck(Base):
+    """Shared set of questions, stored once and read by every subscriber."""
+
+    __tablename__ = "decks"
+
+    id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid.uuid4)
+    owner_id: Mapped[uuid.UUID] = mapped_column(index=True)
+    name: Mapped[str] = mapped_column(String(120), nullable=False)
+    description: Mapped[str] = mapped_column(Text, nullable=False, default="")
+    is_public: Mapped[bool] = mapped_column(Boolean, nullable=False, default=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+
+class DeckQuestion(Base):
+    """Membership of one of the deck owner's questions in a deck (a question may be in several)."""
+
+    __tablename__ = "deck_questions"
+
+    deck_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("decks.id", ondelete="CASCADE"), primary_key=True)
+    question_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("questions.id", ondelete="CASCADE"), primary_key=True, index=True
+    )
+    added_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+
+class DeckSubscription(Base):
+    __tablename__ = "deck_subscriptions"
+
+    user_id: Mapped[uuid.UUID] = mapped_column(primary_key=True)
+    deck_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("decks.id", ondelete="CASCADE"), primary_key=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+
+class DeckCardState(Base):
+    """
+    A subscriber's scheduling state for one shared deck question. No row means
+    never reviewed (due now). forked_question_id points at the subscriber's
+    private copy once they edited the card; the shared card is then hidden for them.
+    """
+
+    __tablename__ = "deck_card_states"
+    __table_args__ = (Index("ix_deck_card_states_user_next_review", "user_id", "next_review_at"),)
+
+    user_id: Mapped[uuid.UUID] = mapped_column(primary_key=True)
+    question_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("questions.id", ondelete="CASCADE"), primary_key=True)
+
+    review_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    mastery_score: Mapped[float] = mapped_column(Float, default=0.0, nullable=False)
+    next_review_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+
+    forked_question_id: Mapped[uuid.UUID | None] = mapped_column(
+        ForeignKey("questions.id", ondelete="SET NULL"), nullable=True
+    )
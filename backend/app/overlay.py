@@ -0,0 +1,39 @@
+"""Query builders for shared deck cards seen through a subscriber's deck_card_states."""
+import uuid
+from datetime import datetime
+
+from sqlalchemy import and_, exists, func, or_, select
+
+from . import models
+
+Q, S = models.Question, models.DeckCardState
+
+
+def with_state(user_id: uuid.UUID, *columns):
+    """
+    Questions joined to the user's deck_card_states row (None = never reviewed),
+    selecting `columns` or (Question, DeckCardState); forked cards are left out.
+    """
+    return (
+        select(*(columns or (Q, S)))
+        .select_from(Q)
+        .outerjoin(S, and_(S.question_id == Q.id, S.user_id == user_id))
+        .where(S.forked_question_id.is_(None))
+    )
+
+
+def in_subscribed_deck(user_id: uuid.UUID):
+    DQ, DS = models.DeckQuestion, models.DeckSubscription
+    return and_(
+        Q.user_id != user_id,
+        exists().where(DQ.question_id == Q.id, DS.deck_id == DQ.deck_id, DS.user_id == user_id),
+    )
+
+
+def next_review_at():
+    # Never-reviewed shared cards are due from the moment they were written.
+    return func.coalesce(S.next_review_at, Q.created_at)
+
+
+def is_due(now: datetime):
+    return or_(S.next_review_at.is_(None), S.next_review_at <= now)
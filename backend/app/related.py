@@ -0,0 +1,181 @@
+import math
+import re
+import threading
+import uuid
+import zlib
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from . import models
+from .lru import UserLRU
+from .settings import settings
+
+# Hashed bag-of-words vectors ("hashing trick") so rows can be added or replaced
+# one at a time without a shared vocabulary or a full recompute.
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_STOPWORDS = frozenset(
+    "a an and are as at be by can do does for from how in is it of on or that the "
+    "this to was what when which why with you your".split()
+)
+_TAG_WEIGHT = 2.0
+
+
+def _hash(token: str, dim: int) -> tuple[int, float]:
+    h = zlib.crc32(token.encode("utf-8"))
+    return h % dim, (1.0 if h & 0x80000000 else -1.0)
+
+
+SparseVec = tuple[np.ndarray, np.ndarray]  # (sorted int32 feature indexes, float32 weights)
+
+
+def vectorize(question_text: str, answer_md: str, tags: list[str], dim: int, max_features: int) -> SparseVec:
+    counts: dict[str, int] = {}
+    for tok in _TOKEN_RE.findall(f"{question_text}\n{answer_md}".lower()):
+        if tok in _STOPWORDS or len(tok) < 2:
+            continue
+        counts[tok] = counts.get(tok, 0) + 1
+
+    weights: dict[int, float] = {}
+    for tok, c in counts.items():
+        idx, sign = _hash(tok, dim)
+        weights[idx] = weights.get(idx, 0.0) + sign * (1.0 + math.log(c))
+    for name in tags:
+        idx, sign = _hash(f"tag:{name}", dim)
+        weights[idx] = weights.get(idx, 0.0) + sign * _TAG_WEIGHT
+
+    # Keep the strongest features only, so memory per question is bounded.
+    kept = sorted(weights.items(), key=lambda kv: -abs(kv[1]))[:max_features]
+    kept.sort()
+    idx = np.fromiter((i for i, _ in kept), dtype=np.int32, count=len(kept))
+    val = np.fromiter((w for _, w in kept), dtype=np.float32, count=len(kept))
+
+    norm = float(np.linalg.norm(val))
+    if norm > 0:
+        val /= norm
+    return idx, val
+
+
+class _UserIndex:
+    """Sparse unit vectors for one user, flattened CSR-style for scoring."""
+
+    def __init__(self, dim: int):
+        self.dim = dim
+        self.ids: list[uuid.UUID] = []
+        self.pos: dict[uuid.UUID, int] = {}
+        self.rows: list[SparseVec] = []
+        self._flat: tuple[np.ndarray, np.ndarray, np.ndarray] | None = None  # rebuilt after writes
+        self.lock = threading.Lock()
+
+    def upsert(self, qid: uuid.UUID, vec: SparseVec) -> None:
+        with self.lock:
+            i = self.pos.get(qid)
+            if i is None:
+                self.pos[qid] = len(self.ids)
+                self.ids.append(qid)
+                self.rows.append(vec)
+            else:
+                self.rows[i] = vec
+            self._flat = None
+
+    def remove(self, qid: uuid.UUID) -> None:
+        with self.lock:
+            i = self.pos.pop(qid, None)
+            if i is None:
+                return
+            last = len(self.ids) - 1
+            if i != last:
+                # swap-remove keeps rows contiguous
+                moved = self.ids[last]
+                self.ids[i] = moved
+                self.pos[moved] = i
+                self.rows[i] = self.rows[last]
+            self.ids.pop()
+            self.rows.pop()
+            self._flat = None
+
+    def _flatten(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        if self._flat is None:
+            lengths = [len(idx) for idx, _ in self.rows]
+            self._flat = (
+                np.concatenate([idx for idx, _ in self.rows]),
+                np.concatenate([val for _, val in self.rows]),
+                np.repeat(np.arange(len(self.rows)), lengths),
+            )
+        return self._flat
+
+    def top_k(self, qid: uuid.UUID, k: int) -> list[tuple[uuid.UUID, float]] | None:
+        with self.lock:
+            i = self.pos.get(qid)
+            if i is None:
+                return None
+            n = len(self.ids)
+            if n <= 1 or k <= 0:
+                return []
+            query = np.zeros(self.dim, dtype=np.float32)
+            query[self.rows[i][0]] = self.rows[i][1]
+            idx, val, row = self._flatten()
+            scores = np.bincount(row, weights=query[idx] * val, minlength=n)
+            scores[i] = -np.inf
+            k = min(k, n - 1)
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top])]
+            return [(self.ids[j], float(scores[j])) for j in top if scores[j] > 0]
+
+
+class RelatedIndex:
+    """Per-user similarity indexes, LRU-evicted across users."""
+
+    def __init__(self, max_users: int, dim: int, max_features: int):
+        self.dim = dim
+        self.max_features = max_features
+        self._users: UserLRU[_UserIndex] = UserLRU(max_users)
+
+    def _load(self, db: Session, user_id: uuid.UUID) -> _UserIndex:
+        rows = db.execute(
+            select(models.Question.id, models.Question.question_text, models.Question.answer_md)
+            .where(models.Question.user_id == user_id)
+        ).all()
+        tag_rows = db.execute(
+            select(models.QuestionTag.question_id, models.Tag.name)
+            .join(models.Tag, models.Tag.id == models.QuestionTag.tag_id)
+            .where(models.Tag.user_id == user_id)
+        ).all()
+        tags_by_qid: dict[uuid.UUID, list[str]] = {}
+        for qid, name in tag_rows:
+            tags_by_qid.setdefault(qid, []).append(name)
+
+        idx = _UserIndex(self.dim)
+        for qid, text, answer in rows:
+            idx.upsert(qid, vectorize(text, answer, tags_by_qid.get(qid, []), self.dim, self.max_features))
+        return self._users.put(user_id, idx)
+
+    def warm(self, db: Session, user_id: uuid.UUID) -> int:
+        """Rebuild and cache the user's vectors; returns how many questions were indexed."""
+        return len(self._load(db, user_id).ids)
+
+    def related(self, db: Session, user_id: uuid.UUID, qid: uuid.UUID, k: int) -> list[tuple[uuid.UUID, float]] | None:
+        idx = self._users.get(user_id) or self._load(db, user_id)
+        return idx.top_k(qid, k)
+
+    def upsert(self, user_id: uuid.UUID, q: models.Question) -> None:
+        # Uncached users are loaded from the database on their next query anyway.
+        idx = self._users.get(user_id)
+        if idx is not None:
+            idx.upsert(q.id, vectorize(q.question_text, q.answer_md, [t.name for t in q.tags], self.dim, self.max_features))
+
+    def remove(self, user_id: uuid.UUID, qid: uuid.UUID) -> None:
+        idx = self._users.get(user_id)
+        if idx is not None:
+            idx.remove(qid)
+
+    def invalidate(self, user_id: uuid.UUID) -> None:
+        self._users.pop(user_id)
+
+
+related_index = RelatedIndex(
+    max_users=settings.RELATED_CACHE_USERS,
+    dim=settings.RELATED_VECTOR_DIM,
+    max_features=settings.RELATED_MAX_FEATURES,
+)
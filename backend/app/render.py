@@ -0,0 +1,73 @@
+import hashlib
+import html
+import re
+import threading
+from collections import OrderedDict
+
+import markdown
+from markdown.treeprocessors import Treeprocessor
+
+from .settings import settings
+
+_SAFE_SCHEMES = frozenset({"http", "https", "mailto"})
+# Browsers drop control characters and whitespace inside URLs ("java\tscript:"),
+# so they must not hide a scheme from the check either.
+_IGNORED_URL_CHARS = re.compile(r"[\x00-\x20\x7f-\x9f]+")
+_SCHEME_RE = re.compile(r"([a-z][a-z0-9+.\-]*):", re.IGNORECASE)
+
+
+def is_safe_url(url: str) -> bool:
+    """Allow http(s), mailto and relative URLs, judged as the browser will decode them."""
+    url = _IGNORED_URL_CHARS.sub("", html.unescape(url))
+    m = _SCHEME_RE.match(url)
+    return m is None or m.group(1).lower() in _SAFE_SCHEMES
+
+
+class _DropUnsafeLinks(Treeprocessor):
+    def run(self, root):
+        for el in root.iter():
+            for attr in ("href", "src"):
+                value = el.get(attr)
+                if value is not None and not is_safe_url(value):
+                    del el.attrib[attr]
+
+
+def _new_renderer() -> markdown.Markdown:
+    md = markdown.Markdown(extensions=["fenced_code", "tables", "sane_lists"])
+    # Raw HTML in answers is shown as text, never passed through to clients.
+    md.preprocessors.deregister("html_block")
+    md.inlinePatterns.deregister("html")
+    md.treeprocessors.register(_DropUnsafeLinks(md), "drop_unsafe_links", 0)
+    return md
+
+
+class MarkdownCache:
+    """answer_md -> HTML, keyed by content hash so identical answers render once."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[bytes, str] = OrderedDict()
+        self._lock = threading.Lock()
+        self._local = threading.local()  # Markdown instances are not thread-safe
+
+    def render(self, text: str) -> str:
+        key = hashlib.sha256(text.encode("utf-8")).digest()
+        with self._lock:
+            html = self._entries.get(key)
+            if html is not None:
+                self._entries.move_to_end(key)
+                return html
+
+        md = getattr(self._local, "md", None)
+        if md is None:
+            md = self._local.md = _new_renderer()
+        html = md.reset().convert(text)
+
+        with self._lock:
+            self._entries[key] = html
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return html
+
+
+markdown_cache = MarkdownCache(max_entries=settings.RENDER_CACHE_SIZE)
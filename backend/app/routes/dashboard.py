@@ -1,14 +1,16 @@
-from datetime import datetime
+from datetime import date, datetime, timedelta
 from typing import List
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Query
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
 from sqlalchemy import func
 
+from .. import overlay
 from ..db import get_db
 from ..deps import get_current_user
-from ..models import User, Question, Tag, QuestionTag
+from ..forecast import due_counts, what_if
+from ..models import User, Question, Tag, QuestionTag, ReviewDailyRollup
 
 router = APIRouter(prefix="/v1/dashboard", tags=["dashboard"])
 
@@ -27,6 +29,42 @@ class DashboardStatsOut(BaseModel):
     weakest_tags: List[WeakTag]
 
 
+class ActivityDay(BaseModel):
+    day: date
+    reviews: int
+    forgot: int
+    almost: int
+    knew: int
+    mastery_delta: float
+
+
+class ActivityOut(BaseModel):
+    days: List[ActivityDay]  # only days with at least one review
+    total_reviews: int
+    active_days: int
+    current_streak: int
+    longest_streak: int
+
+
+class TagForecast(BaseModel):
+    name: str
+    due: List[int]
+
+
+class WhatIfOut(BaseModel):
+    intervals: List[int]
+    baseline: List[int]  # projected reviews per day under the current policy
+    projected: List[int]  # ... and under `intervals`
+
+
+class ForecastOut(BaseModel):
+    start: date
+    overdue: int
+    due: List[int]  # due cards per day from `start`; overdue cards count on day 0
+    tags: List[TagForecast]
+    what_if: WhatIfOut | None = None
+
+
 @router.get("/stats", response_model=DashboardStatsOut)
 def stats(
     db: Session = Depends(get_db),
@@ -48,6 +86,11 @@ def stats(
         .scalar()
         or 0
     )
+    due_now += db.scalar(
+        overlay.with_state(current_user.id, func.count()).where(
+            overlay.in_subscribed_deck(current_user.id), overlay.is_due(now)
+        )
+    )
 
     avg_mastery = (
         db.query(func.avg(Question.mastery_score))
@@ -97,3 +140,86 @@ def stats(
         total_reviews=total_reviews,
         weakest_tags=weakest_tags,
     )
+
+
+@router.get("/activity", response_model=ActivityOut)
+def activity(
+    days: int = Query(default=365, ge=1, le=366),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    today = datetime.utcnow().date()
+    since = today - timedelta(days=days - 1)
+
+    # Reads the all-tags rollup rows only: at most `days` rows per user.
+    rows = (
+        db.query(ReviewDailyRollup)
+        .filter(ReviewDailyRollup.user_id == current_user.id)
+        .filter(ReviewDailyRollup.tag == "")
+        .filter(ReviewDailyRollup.day >= since)
+        .order_by(ReviewDailyRollup.day.asc())
+        .all()
+    )
+
+    out = [
+        ActivityDay(
+            day=r.day,
+            reviews=r.forgot_count + r.almost_count + r.knew_count,
+            forgot=r.forgot_count,
+            almost=r.almost_count,
+            knew=r.knew_count,
+            mastery_delta=float(r.mastery_delta or 0.0),
+        )
+        for r in rows
+    ]
+
+    longest = run = 0
+    prev = None
+    for d in out:
+        run = run + 1 if prev is not None and d.day - prev == timedelta(days=1) else 1
+        longest = max(longest, run)
+        prev = d.day
+
+    # A streak is still alive if the last review was today or yesterday.
+    current = run if prev is not None and (today - prev).days <= 1 else 0
+
+    return ActivityOut(
+        days=out,
+        total_reviews=sum(d.reviews for d in out),
+        active_days=len(out),
+        current_streak=current,
+        longest_streak=longest,
+    )
+
+
+@router.get("/forecast", response_model=ForecastOut)
+def forecast(
+    days: int = Query(default=30, ge=1, le=366),
+    intervals: str | None = Query(
+        default=None,
+        description='What-if policy: days after "forgot", "almost", "knew", e.g. "1,4,10"',
+    ),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    today = datetime.utcnow().date()
+    counts = due_counts(db, current_user.id, today, days)
+    series = counts["series"]
+
+    projection = None
+    if intervals:
+        try:
+            policy = [int(x) for x in intervals.split(",")]
+        except ValueError:
+            policy = []
+        if len(policy) != 3 or min(policy) < 1:
+            raise HTTPException(status_code=400, detail="intervals must be three positive day counts, e.g. 1,4,10")
+        projection = WhatIfOut(**what_if(db, current_user.id, today, days, policy))
+
+    return ForecastOut(
+        start=today,
+        overdue=counts["overdue"],
+        due=series[""],
+        tags=[TagForecast(name=name, due=due) for name, due in sorted(series.items()) if name],
+        what_if=projection,
+    )
@@ -0,0 +1,207 @@
+import uuid
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+
+from ..db import get_db
+from .. import crud
+from ..deps import get_current_user
+from ..forecast import forecast_cache
+from ..models import Deck, DeckCardState, Question, User
+from ..schemas import DeckCardsAdd, DeckCreate, DeckOut, QuestionOut, QuestionUpdate
+from .questions import _deck_card_out, _to_out
+
+router = APIRouter(prefix="/v1/decks", tags=["decks"])
+
+
+def _deck_out(deck: Deck, user: User, question_count: int, subscribed: bool) -> DeckOut:
+    return DeckOut(
+        id=deck.id,
+        name=deck.name,
+        description=deck.description,
+        is_public=deck.is_public,
+        is_owner=deck.owner_id == user.id,
+        subscribed=subscribed,
+        question_count=question_count,
+        created_at=deck.created_at,
+    )
+
+
+def _card_out(q: Question, state: DeckCardState | None, user: User) -> QuestionOut:
+    return _to_out(q) if q.user_id == user.id else _deck_card_out(q, state)
+
+
+def _visible_deck(db: Session, user: User, deck_id: uuid.UUID) -> Deck:
+    deck = crud.get_deck(db, deck_id)
+    if not deck or (not deck.is_public and deck.owner_id != user.id):
+        raise HTTPException(status_code=404, detail="Deck not found")
+    return deck
+
+
+def _owned_deck(db: Session, user: User, deck_id: uuid.UUID) -> Deck:
+    deck = _visible_deck(db, user, deck_id)
+    if deck.owner_id != user.id:
+        raise HTTPException(status_code=403, detail="Only the deck owner can do this")
+    return deck
+
+
+def _member_deck(db: Session, user: User, deck_id: uuid.UUID) -> Deck:
+    deck = _visible_deck(db, user, deck_id)
+    if deck.owner_id != user.id and not crud.is_subscribed(db, user.id, deck.id):
+        raise HTTPException(status_code=403, detail="Subscribe to this deck first")
+    return deck
+
+
+# -----------------------------
+# Decks
+# -----------------------------
+@router.post("", response_model=DeckOut)
+def create(
+    payload: DeckCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    if not payload.name.strip():
+        raise HTTPException(status_code=400, detail="Deck name must not be blank")
+    deck, attached = crud.create_deck(db, current_user.id, payload)
+    return _deck_out(deck, current_user, attached, False)
+
+
+@router.get("", response_model=list[DeckOut])
+def list_(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    return [
+        _deck_out(deck, current_user, count, subscribed)
+        for deck, count, subscribed in crud.list_decks(db, current_user.id)
+    ]
+
+
+@router.delete("/{deck_id}")
+def delete(
+    deck_id: uuid.UUID,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    deck = _owned_deck(db, current_user, deck_id)
+    crud.delete_deck(db, deck)
+    return {"status": "deleted"}
+
+
+@router.post("/{deck_id}/questions")
+def add_questions(
+    deck_id: uuid.UUID,
+    payload: DeckCardsAdd,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    deck = _owned_deck(db, current_user, deck_id)
+    return {"added": crud.add_deck_questions(db, deck, payload.ids)}
+
+
+@router.delete("/{deck_id}/questions/{qid}")
+def remove_question(
+    deck_id: uuid.UUID,
+    qid: uuid.UUID,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    deck = _owned_deck(db, current_user, deck_id)
+    if not crud.remove_deck_question(db, deck, qid):
+        raise HTTPException(status_code=404, detail="Question not found")
+    return {"status": "removed"}
+
+
+# -----------------------------
+# Subscriptions
+# -----------------------------
+@router.post("/{deck_id}/subscribe", response_model=DeckOut)
+def subscribe(
+    deck_id: uuid.UUID,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    deck = _visible_deck(db, current_user, deck_id)
+    if deck.owner_id == current_user.id:
+        raise HTTPException(status_code=400, detail="You own this deck")
+    crud.subscribe(db, current_user.id, deck.id)
+    return _deck_out(deck, current_user, crud.count_deck_questions(db, deck.id), True)
+
+
+@router.delete("/{deck_id}/subscribe")
+def unsubscribe(
+    deck_id: uuid.UUID,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    deck = _visible_deck(db, current_user, deck_id)
+    crud.unsubscribe(db, current_user.id, deck.id)
+    return {"status": "unsubscribed"}
+
+
+# -----------------------------
+# Cards
+# -----------------------------
+@router.get("/{deck_id}/questions", response_model=list[QuestionOut])
+def list_questions(
+    deck_id: uuid.UUID,
+    due_only: bool = Query(default=False),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    deck = _member_deck(db, current_user, deck_id)
+    cards = crud.list_deck_cards(db, current_user.id, deck, datetime.utcnow() if due_only else None)
+    return [_card_out(q, state, current_user) for q, state in cards]
+
+
+@router.post("/{deck_id}/questions/{qid}/review")
+def review(
+    deck_id: uuid.UUID,
+    qid: uuid.UUID,
+    rating: str = Query(..., description='One of: "forgot", "almost", "knew"'),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    rating = rating.lower().strip()
+    if rating not in crud.REVIEW_RULES:
+        raise HTTPException(status_code=400, detail='Invalid rating. Use "forgot", "almost", or "knew".')
+
+    deck = _member_deck(db, current_user, deck_id)
+    if not crud.get_deck_card(db, current_user.id, deck, qid):
+        raise HTTPException(status_code=404, detail="Question not found")
+
+    now = datetime.utcnow()
+    if deck.owner_id == current_user.id:
+        row = crud.review_question(db, current_user.id, qid, rating, now)
+    else:
+        row = crud.review_deck_card(db, current_user.id, qid, rating, now)
+
+    db.commit()
+    forecast_cache.invalidate(current_user.id)
+    return {"status": "ok", "next_review_at": row.next_review_at, "mastery_score": float(row.mastery_score)}
+
+
+@router.patch("/{deck_id}/questions/{qid}", response_model=QuestionOut)
+def patch(
+    deck_id: uuid.UUID,
+    qid: uuid.UUID,
+    payload: QuestionUpdate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    The owner edits the shared card in place. A subscriber's edit is copy-on-write:
+    it returns their new private question and hides the shared card for them.
+    """
+    deck = _member_deck(db, current_user, deck_id)
+    card = crud.get_deck_card(db, current_user.id, deck, qid)
+    if not card:
+        raise HTTPException(status_code=404, detail="Question not found")
+
+    if deck.owner_id == current_user.id:
+        q = crud.update_question(db, current_user.id, qid, payload)
+    else:
+        q = crud.fork_deck_card(db, current_user.id, card[0], card[1], payload)
+    return _to_out(q)
@@ -0,0 +1,76 @@
+import uuid
+
+from fastapi import APIRouter, Depends, HTTPException
+from pydantic import ValidationError
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from ..db import get_db
+from ..deps import get_current_user
+from ..jobs import job_runner
+from ..models import Job, User
+from ..schemas import JobCreate, JobOut, QuestionCreate
+
+router = APIRouter(prefix="/v1/jobs", tags=["jobs"])
+
+
+def _to_out(job: Job) -> JobOut:
+    return JobOut(
+        id=job.id,
+        kind=job.kind,
+        status=job.status,
+        progress=job.progress,
+        result=job.result,
+        error=job.error,
+        created_at=job.created_at,
+        started_at=job.started_at,
+        finished_at=job.finished_at,
+    )
+
+
+@router.post("", response_model=JobOut, status_code=202)
+def create(
+    payload: JobCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    if payload.kind == "import":
+        # Fail fast on bad rows instead of inside the worker.
+        try:
+            [QuestionCreate(**item) for item in payload.params.get("questions", [])]
+        except (TypeError, ValidationError) as e:
+            raise HTTPException(status_code=400, detail=f"Invalid import payload: {e}")
+
+    job = Job(user_id=current_user.id, kind=payload.kind, params=payload.params)
+    db.add(job)
+    try:
+        db.commit()
+    except IntegrityError:
+        # uq_jobs_user_active: one queued/running job per user
+        db.rollback()
+        raise HTTPException(status_code=409, detail="Another job is already queued or running")
+
+    job_runner.submit(job.id)
+    return _to_out(job)
+
+
+@router.get("", response_model=list[JobOut])
+def list_(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    stmt = select(Job).where(Job.user_id == current_user.id).order_by(Job.created_at.desc()).limit(20)
+    return [_to_out(j) for j in db.execute(stmt).scalars().all()]
+
+
+@router.get("/{job_id}", response_model=JobOut)
+def get_one(
+    job_id: uuid.UUID,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    job = db.execute(select(Job).where(Job.user_id == current_user.id, Job.id == job_id)).scalars().first()
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return _to_out(job)
@@ -1,19 +1,22 @@
 import uuid
-from datetime import datetime, timedelta
+from datetime import datetime
+from typing import Literal
 
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 
 from ..db import get_db
 from .. import crud
-from ..schemas import QuestionCreate, QuestionUpdate, QuestionOut
+from ..schemas import BulkAction, BulkResult, QuestionCreate, QuestionUpdate, QuestionOut, RelatedQuestionOut
 from ..deps import get_current_user
 from ..models import User
+from ..forecast import forecast_cache
+from ..related import related_index
 
 router = APIRouter(prefix="/v1/questions", tags=["questions"])
 
 
-def _to_out(q) -> QuestionOut:
+def _to_out(q, answer_html: str | None = None) -> QuestionOut:
     return QuestionOut(
         id=q.id,
         question_text=q.question_text,
@@ -27,6 +30,19 @@ def _to_out(q) -> QuestionOut:
         review_count=q.review_count,
         mastery_score=q.mastery_score,
         next_review_at=q.next_review_at,
+        answer_html=answer_html,
+    )
+
+
+def _deck_card_out(q, state, answer_html: str | None = None) -> QuestionOut:
+    # A subscribed deck card: shared content, personal scheduling state.
+    return _to_out(q, answer_html).model_copy(
+        update={
+            "is_flagged": False,
+            "review_count": state.review_count if state else 0,
+            "mastery_score": state.mastery_score if state else 0.0,
+            "next_review_at": state.next_review_at if state else q.created_at,
+        }
     )
 
 
@@ -40,6 +56,21 @@ def create(
     return _to_out(q)
 
 
+@router.post("/bulk", response_model=BulkResult)
+def bulk(
+    payload: BulkAction,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    if payload.ids is None and payload.filter is None:
+        raise HTTPException(status_code=400, detail='Provide "ids", "filter", or both')
+    if payload.action in ("add_tag", "remove_tag") and not (payload.tag or "").strip():
+        raise HTTPException(status_code=400, detail=f'"tag" is required for {payload.action}')
+
+    affected = crud.bulk_update(db, current_user.id, payload)
+    return BulkResult(action=payload.action, affected=affected)
+
+
 @router.get("", response_model=list[QuestionOut])
 def list_(
     db: Session = Depends(get_db),
@@ -48,26 +79,66 @@ def list_(
     tag: str | None = Query(default=None),
     flagged: bool | None = Query(default=None),
     due_only: bool | None = Query(default=False),
+    render: Literal["html"] | None = Query(default=None),
 ):
     items = crud.list_questions(db, current_user.id, search, tag, flagged)
+    shared = []
 
     if due_only:
         now = datetime.utcnow()
         items = [q for q in items if (q.next_review_at is None) or (q.next_review_at <= now)]
+        # Cards from subscribed decks are never flagged.
+        if not flagged:
+            shared = crud.list_subscribed_due(db, current_user.id, now, search=search, tag=tag)
 
-    return [_to_out(q) for q in items]
+    html = crud.rendered_answers(db, items + [q for q, _ in shared]) if render == "html" else {}
+    return [_to_out(q, html.get(q.id)) for q in items] + [
+        _deck_card_out(q, state, html.get(q.id)) for q, state in shared
+    ]
 
 
 @router.get("/{qid}", response_model=QuestionOut)
 def get_one(
     qid: uuid.UUID,
+    render: Literal["html"] | None = Query(default=None),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
     q = crud.get_question(db, current_user.id, qid)
+    state = None
     if not q:
+        card = crud.get_subscribed_card(db, current_user.id, qid)
+        if not card:
+            raise HTTPException(status_code=404, detail="Question not found")
+        q, state = card
+    html = crud.rendered_answers(db, [q])[q.id] if render == "html" else None
+    return _to_out(q, html) if q.user_id == current_user.id else _deck_card_out(q, state, html)
+
+
+@router.get("/{qid}/related", response_model=list[RelatedQuestionOut])
+def related(
+    qid: uuid.UUID,
+    k: int = Query(default=10, ge=1, le=50),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    hits = related_index.related(db, current_user.id, qid, k)
+    if hits is None:
         raise HTTPException(status_code=404, detail="Question not found")
-    return _to_out(q)
+
+    by_id = {q.id: q for q in crud.get_questions_by_ids(db, current_user.id, [h[0] for h in hits])}
+    return [
+        RelatedQuestionOut(
+            id=q.id,
+            question_text=q.question_text,
+            difficulty=q.difficulty,
+            tags=[t.name for t in q.tags],
+            mastery_score=q.mastery_score,
+            score=score,
+        )
+        for rid, score in hits
+        if (q := by_id.get(rid)) is not None
+    ]
 
 
 @router.patch("/{qid}", response_model=QuestionOut)
@@ -77,11 +148,13 @@ def patch(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    q = crud.get_question(db, current_user.id, qid)
+    q = crud.update_question(db, current_user.id, qid, payload)
     if not q:
-        raise HTTPException(status_code=404, detail="Question not found")
-
-    q = crud.update_question(db, q, current_user.id, payload)
+        # Editing a subscribed deck card forks it into a private copy.
+        card = crud.get_subscribed_card(db, current_user.id, qid)
+        if not card:
+            raise HTTPException(status_code=404, detail="Question not found")
+        q = crud.fork_deck_card(db, current_user.id, card[0], card[1], payload)
     return _to_out(q)
 
 
@@ -94,8 +167,7 @@ def delete(
     q = crud.get_question(db, current_user.id, qid)
     if not q:
         raise HTTPException(status_code=404, detail="Question not found")
-    db.delete(q)
-    db.commit()
+    crud.delete_question(db, q, current_user.id)
     return {"status": "deleted"}
 
 
@@ -106,29 +178,17 @@ def review(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    q = crud.get_question(db, current_user.id, qid)
-    if not q:
-        raise HTTPException(status_code=404, detail="Question not found")
-
-    q.review_count = (q.review_count or 0) + 1
-
     rating = rating.lower().strip()
-    if rating == "forgot":
-        q.mastery_score = float(q.mastery_score or 0.0) - 0.3
-        interval_days = 1
-    elif rating == "almost":
-        q.mastery_score = float(q.mastery_score or 0.0) + 0.1
-        interval_days = 3
-    elif rating == "knew":
-        q.mastery_score = float(q.mastery_score or 0.0) + 0.3
-        interval_days = 7
-    else:
+    if rating not in crud.REVIEW_RULES:
         raise HTTPException(status_code=400, detail='Invalid rating. Use "forgot", "almost", or "knew".')
 
-    q.mastery_score = max(0.0, min(5.0, q.mastery_score))
-
-    q.next_review_at = datetime.utcnow() + timedelta(days=interval_days)
-    q.updated_at = datetime.utcnow()
+    now = datetime.utcnow()
+    row = crud.review_question(db, current_user.id, qid, rating, now)
+    if not row:
+        if not crud.get_subscribed_card(db, current_user.id, qid):
+            raise HTTPException(status_code=404, detail="Question not found")
+        row = crud.review_deck_card(db, current_user.id, qid, rating, now)
 
     db.commit()
-    return {"status": "ok", "next_review_at": q.next_review_at, "mastery_score": q.mastery_score}
+    forecast_cache.invalidate(current_user.id)
+    return {"status": "ok", "next_review_at": row.next_review_at, "mastery_score": float(row.mastery_score)}
@@ -0,0 +1,145 @@
+import uuid
+from collections import deque
+from datetime import datetime
+
+from fastapi import APIRouter, HTTPException, WebSocket, WebSocketDisconnect
+from starlette.concurrency import run_in_threadpool
+
+from ..db import SessionLocal
+from .. import crud
+from ..deps import user_from_token
+from ..forecast import forecast_cache
+from ..schemas import QuestionOut
+from ..settings import settings
+from .questions import _deck_card_out, _to_out
+
+router = APIRouter(prefix="/v1/study", tags=["study"])
+
+
+# -----------------------------
+# Per-connection session state
+# -----------------------------
+class _StudySession:
+    """Prefetched due cards plus reviews not yet written to the database."""
+
+    def __init__(self, user_id: uuid.UUID):
+        self.user_id = user_id
+        self.buffer: deque[QuestionOut] = deque()
+        self.pending: list[tuple[uuid.UUID, str, datetime]] = []
+        self.shared_ids: set[uuid.UUID] = set()  # cards from subscribed decks
+
+    def refill(self) -> None:
+        # Flush first so cards reviewed in this session are no longer due.
+        self.flush()
+        want = settings.STUDY_PREFETCH - len(self.buffer)
+        if want <= 0:
+            return
+        now = datetime.utcnow()
+        exclude = [c.id for c in self.buffer]
+        with SessionLocal() as db:
+            items = crud.list_due_questions(db, self.user_id, now, limit=want, exclude_ids=exclude)
+            self.buffer.extend(_to_out(q) for q in items)
+            # Top up from subscribed decks once the user's own due cards run out.
+            if len(items) < want:
+                shared = crud.list_subscribed_due(
+                    db, self.user_id, now, limit=want - len(items), exclude_ids=exclude
+                )
+                self.shared_ids.update(q.id for q, _ in shared)
+                self.buffer.extend(_deck_card_out(q, state) for q, state in shared)
+
+    def flush(self) -> None:
+        if not self.pending:
+            return
+        pending, self.pending = self.pending, []
+        with SessionLocal() as db:
+            for qid, rating, at in pending:
+                if qid in self.shared_ids:
+                    crud.review_deck_card(db, self.user_id, qid, rating, at)
+                else:
+                    crud.review_question(db, self.user_id, qid, rating, at)
+            db.commit()
+        forecast_cache.invalidate(self.user_id)
+
+    def rate(self, qid: uuid.UUID, rating: str) -> dict:
+        card = self.buffer.popleft()
+        now = datetime.utcnow()
+        mastery, next_review_at = crud.schedule_review(card.mastery_score, rating, now)
+        self.pending.append((qid, rating, now))
+        return {
+            "id": str(qid),
+            "review_count": card.review_count + 1,
+            "mastery_score": mastery,
+            "next_review_at": next_review_at.isoformat(),
+        }
+
+    @property
+    def needs_refill(self) -> bool:
+        return len(self.buffer) <= 1 or len(self.pending) >= settings.STUDY_REVIEW_BATCH
+
+    def current(self) -> dict | None:
+        return self.buffer[0].model_dump(mode="json") if self.buffer else None
+
+
+def _authenticate(token: str | None) -> uuid.UUID:
+    with SessionLocal() as db:
+        return user_from_token(db, token).id
+
+
+# -----------------------------
+# Routes
+# -----------------------------
+@router.websocket("/ws")
+async def study_ws(websocket: WebSocket):
+    """
+    Client -> server: {"type": "rate", "id": "<question id>", "rating": "forgot" | "almost" | "knew"}
+    Server -> client: {"type": "card", "card": {...} | null} once on connect, then
+                      {"type": "reviewed", "result": {...}, "next": {...} | null} per rating.
+    """
+    # The cookie is sent cross-site (SameSite=none in split-domain deployments) and
+    # CORS does not cover WebSockets, so the Origin has to be checked here.
+    if websocket.headers.get("origin") not in settings.cors_list():
+        await websocket.close(code=1008)
+        return
+
+    try:
+        user_id = await run_in_threadpool(_authenticate, websocket.cookies.get("access_token"))
+    except HTTPException:
+        await websocket.close(code=1008)
+        return
+
+    await websocket.accept()
+    session = _StudySession(user_id)
+    try:
+        await run_in_threadpool(session.refill)
+        await websocket.send_json({"type": "card", "card": session.current()})
+
+        while True:
+            try:
+                msg = await websocket.receive_json()
+            except (ValueError, KeyError, TypeError):
+                # not JSON, or a binary frame
+                await websocket.send_json({"type": "error", "detail": "Messages must be JSON text frames"})
+                continue
+            if not isinstance(msg, dict) or msg.get("type") != "rate":
+                await websocket.send_json({"type": "error", "detail": 'Unknown message type. Use "rate".'})
+                continue
+
+            card = session.buffer[0] if session.buffer else None
+            rating = str(msg.get("rating", "")).lower().strip()
+            if card is None or str(msg.get("id")) != str(card.id):
+                await websocket.send_json({"type": "error", "detail": "Rating does not match the current card"})
+                continue
+            if rating not in crud.REVIEW_RULES:
+                await websocket.send_json(
+                    {"type": "error", "detail": 'Invalid rating. Use "forgot", "almost", or "knew".'}
+                )
+                continue
+
+            result = session.rate(card.id, rating)
+            if session.needs_refill:
+                await run_in_threadpool(session.refill)
+            await websocket.send_json({"type": "reviewed", "result": result, "next": session.current()})
+    except WebSocketDisconnect:
+        pass
+    finally:
+        await run_in_threadpool(session.flush)
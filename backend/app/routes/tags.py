@@ -0,0 +1,66 @@
+import uuid
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+
+from ..db import get_db
+from .. import crud
+from ..deps import get_current_user
+from ..models import User
+from ..schemas import TagMerge, TagMergeOut, TagOut, TagRename
+from ..tag_index import tag_index
+
+router = APIRouter(prefix="/v1/tags", tags=["tags"])
+
+
+@router.get("", response_model=list[TagOut])
+def list_(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+    prefix: str = Query(default=""),
+    limit: int = Query(default=20, ge=1, le=200),
+):
+    hits = tag_index.suggest(db, current_user.id, prefix, limit)
+    return [TagOut(id=tid, name=name, question_count=count) for tid, name, count in hits]
+
+
+@router.patch("/{tag_id}", response_model=TagOut)
+def rename(
+    tag_id: uuid.UUID,
+    payload: TagRename,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    tag = crud.get_tag(db, current_user.id, tag_id)
+    if not tag:
+        raise HTTPException(status_code=404, detail="Tag not found")
+
+    name = payload.name.strip().lower()
+    if not name:
+        raise HTTPException(status_code=400, detail="Tag name must not be blank")
+    if name != tag.name:
+        if crud.get_tag_by_name(db, current_user.id, name):
+            raise HTTPException(status_code=409, detail="Tag already exists; merge into it instead")
+        tag = crud.rename_tag(db, current_user.id, tag, name)
+
+    return TagOut(id=tag.id, name=tag.name, question_count=crud.count_tag_questions(db, tag.id))
+
+
+@router.post("/{tag_id}/merge", response_model=TagMergeOut)
+def merge(
+    tag_id: uuid.UUID,
+    payload: TagMerge,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    if payload.into == tag_id:
+        raise HTTPException(status_code=400, detail="Cannot merge a tag into itself")
+
+    source = crud.get_tag(db, current_user.id, tag_id)
+    target = crud.get_tag(db, current_user.id, payload.into)
+    if not source or not target:
+        raise HTTPException(status_code=404, detail="Tag not found")
+
+    moved = crud.merge_tags(db, current_user.id, source, target)
+    into = TagOut(id=target.id, name=target.name, question_count=crud.count_tag_questions(db, target.id))
+    return TagMergeOut(into=into, moved=moved)
@@ -0,0 +1,13 @@
+from datetime import datetime, timedelta
+
+# rating -> (mastery delta, days until next review)
+REVIEW_RULES = {
+    "forgot": (-0.3, 1),
+    "almost": (0.1, 3),
+    "knew": (0.3, 7),
+}
+
+def schedule_review(mastery_score: float, rating: str, now: datetime) -> tuple[float, datetime]:
+    delta, interval_days = REVIEW_RULES[rating]
+    mastery = max(0.0, min(5.0, float(mastery_score or 0.0) + delta))
+    return mastery, now + timedelta(days=interval_days)
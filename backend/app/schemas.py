@@ -1,7 +1,7 @@
 import uuid
 from datetime import datetime
 from pydantic import BaseModel, Field
-from typing import List
+from typing import Any, Dict, List, Literal
 
 class QuestionCreate(BaseModel):
     question_text: str = Field(min_length=3)
@@ -31,3 +31,76 @@ class QuestionOut(BaseModel):
     review_count: int
     mastery_score: float
     next_review_at: datetime
+    answer_html: str | None = None  # only with ?render=html
+
+class RelatedQuestionOut(BaseModel):
+    id: uuid.UUID
+    question_text: str
+    difficulty: int
+    tags: List[str]
+    mastery_score: float
+    score: float
+
+class TagOut(BaseModel):
+    id: uuid.UUID
+    name: str
+    question_count: int
+
+class TagRename(BaseModel):
+    name: str = Field(min_length=1, max_length=50)
+
+class TagMerge(BaseModel):
+    into: uuid.UUID
+
+class TagMergeOut(BaseModel):
+    into: TagOut
+    moved: int
+
+class BulkFilter(BaseModel):
+    search: str | None = None
+    tag: str | None = None
+    flagged: bool | None = None
+
+class BulkAction(BaseModel):
+    action: Literal["flag", "unflag", "delete", "add_tag", "remove_tag"]
+    ids: List[uuid.UUID] | None = None
+    filter: BulkFilter | None = None
+    tag: str | None = None  # for add_tag / remove_tag
+
+class BulkResult(BaseModel):
+    action: str
+    affected: int
+
+class DeckCreate(BaseModel):
+    name: str = Field(min_length=1, max_length=120)
+    description: str = ""
+    is_public: bool = True
+    question_ids: List[uuid.UUID] = []  # your own questions to share through the deck
+
+class DeckCardsAdd(BaseModel):
+    ids: List[uuid.UUID]
+
+class DeckOut(BaseModel):
+    id: uuid.UUID
+    name: str
+    description: str
+    is_public: bool
+    is_owner: bool
+    subscribed: bool
+    question_count: int
+    created_at: datetime
+
+class JobCreate(BaseModel):
+    kind: Literal["import", "export", "reindex", "reschedule"]
+    params: Dict[str, Any] = {}
+
+class JobOut(BaseModel):
+    id: uuid.UUID
+    kind: str
+    status: str
+    progress: float
+    result: Dict[str, Any] | None
+    error: str | None
+    created_at: datetime
+    started_at: datetime | None
+    finished_at: datetime | None
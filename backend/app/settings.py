@@ -10,7 +10,7 @@ class Settings(BaseSettings):
         extra="ignore",
     )
 
-    DATABASE_URL: str
+    DATABASE_URL: str  # postgresql+psycopg://... or sqlite:///path/to/qbank.db
     CORS_ORIGINS: str = "http://localhost:3000"
     DEFAULT_USER_ID: str = "00000000-0000-0000-0000-000000000001"
     JWT_SECRET: str  # from env
@@ -19,6 +19,52 @@ class Settings(BaseSettings):
     REFRESH_TOKEN_DAYS: int = 30
     COOKIE_SECURE: bool = False  # True in prod (https)
 
+    # Embedded SQLite mode only
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_CACHE_KB: int = 65536
+    SQLITE_MMAP_BYTES: int = 268435456
+
+    # "Related questions" similarity index (in-process, per user).
+    # Vectors are sparse, at most RELATED_MAX_FEATURES hashed features per question:
+    # a cached 5,000-card user takes up to ~10 MB, so the index is bounded by roughly
+    # RELATED_CACHE_USERS x 10 MB per process for banks of that size.
+    RELATED_VECTOR_DIM: int = 16384  # hash space; only a transient dense query vector is this long
+    RELATED_MAX_FEATURES: int = 64
+    RELATED_CACHE_USERS: int = 32
+
+    # GET /v1/tags autocomplete prefix index (in-process, per user)
+    TAG_INDEX_CACHE_USERS: int = 256
+
+    # GET /v1/dashboard/forecast results (in-process, per user)
+    FORECAST_CACHE_USERS: int = 256
+
+    # ?render=html: rendered answers cached by content hash, optionally persisted in questions.answer_html
+    RENDER_CACHE_SIZE: int = 2048
+    RENDER_PERSIST_HTML: bool = True
+
+    # Database connection pool (server databases): up to DB_POOL_SIZE + DB_MAX_OVERFLOW per process
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 10
+
+    # Admission control: "group=concurrency:max_queue,..." (groups: auth, heavy, default; empty = off)
+    # Each admitted request holds one pooled connection, so the concurrency limits plus
+    # JOBS_CONCURRENCY should not exceed the pool: 4 + 4 + 10 + 2 = 20 by default.
+    ADMISSION_LIMITS: str = "auth=4:16,heavy=4:32,default=10:128"
+    ADMISSION_QUEUE_TIMEOUT: float = 5.0  # seconds a request may wait for a slot
+    ADMISSION_RETRY_AFTER: int = 2  # Retry-After seconds on 503
+
+    # Background jobs (in-process worker pool per API process; processes coordinate through the jobs table)
+    JOBS_CONCURRENCY: int = 2
+    JOBS_HEARTBEAT_SECONDS: float = 10.0  # running jobs are taken over after 3 missed heartbeats
+
+    # /v1/study/ws: due cards prefetched per connection, reviews persisted per batch
+    STUDY_PREFETCH: int = 10
+    STUDY_REVIEW_BATCH: int = 5
+
+    # Response compression: gzip when the client accepts it and the body is at least this big (0 = off)
+    GZIP_MIN_SIZE: int = 1024
+    GZIP_LEVEL: int = 5  # 1-9; higher saves a little more for noticeably more CPU
+
     def cors_list(self) -> List[str]:
         return [o.strip() for o in self.CORS_ORIGINS.split(",") if o.strip()]
 
@@ -0,0 +1,61 @@
+"""Small SQL constructs that render correctly on both PostgreSQL and SQLite."""
+from sqlalchemy import DateTime, Float
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.functions import FunctionElement
+
+
+class least(FunctionElement):
+    type = Float()
+    inherit_cache = True
+
+
+class greatest(FunctionElement):
+    type = Float()
+    inherit_cache = True
+
+
+class day_start(FunctionElement):
+    """Timestamp truncated to midnight."""
+
+    type = DateTime()
+    inherit_cache = True
+
+
+@compiles(least)
+def _least(element, compiler, **kw):
+    return "LEAST(%s)" % compiler.process(element.clauses, **kw)
+
+
+@compiles(greatest)
+def _greatest(element, compiler, **kw):
+    return "GREATEST(%s)" % compiler.process(element.clauses, **kw)
+
+
+@compiles(day_start)
+def _day_start(element, compiler, **kw):
+    return "date_trunc('day', %s)" % compiler.process(element.clauses, **kw)
+
+
+# SQLite spells LEAST/GREATEST as the multi-argument min()/max().
+@compiles(least, "sqlite")
+def _least_sqlite(element, compiler, **kw):
+    return "min(%s)" % compiler.process(element.clauses, **kw)
+
+
+@compiles(greatest, "sqlite")
+def _greatest_sqlite(element, compiler, **kw):
+    return "max(%s)" % compiler.process(element.clauses, **kw)
+
+
+@compiles(day_start, "sqlite")
+def _day_start_sqlite(element, compiler, **kw):
+    return "datetime(date(%s))" % compiler.process(element.clauses, **kw)
+
+
+def upsert_insert(db: Session, table):
+    """INSERT construct supporting .on_conflict_do_update() for the session's database."""
+    if db.get_bind().dialect.name == "sqlite":
+        return sqlite.insert(table)
+    return postgresql.insert(table)
@@ -0,0 +1,95 @@
+import bisect
+import threading
+import uuid
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from . import models
+from .lru import UserLRU
+from .settings import settings
+
+TagRef = tuple[uuid.UUID, str]  # (tag id, normalized name)
+
+
+class _UserTags:
+    """Sorted tag names with usage counts for one user."""
+
+    def __init__(self):
+        self.names: list[str] = []
+        self.by_name: dict[str, list] = {}  # name -> [tag id, question count]
+        self.lock = threading.Lock()
+
+    def _ensure(self, tag_id: uuid.UUID, name: str) -> list:
+        entry = self.by_name.get(name)
+        if entry is None:
+            entry = self.by_name[name] = [tag_id, 0]
+            bisect.insort(self.names, name)
+        return entry
+
+    def load(self, rows) -> None:
+        for tag_id, name, count in rows:
+            self.by_name[name] = [tag_id, int(count)]
+        self.names = sorted(self.by_name)
+
+    def retag(self, before: list[TagRef], after: list[TagRef]) -> None:
+        old = {tid for tid, _ in before}
+        new = {tid for tid, _ in after}
+        with self.lock:
+            for tid, name in before:
+                if tid not in new and name in self.by_name:
+                    entry = self.by_name[name]
+                    entry[1] = max(0, entry[1] - 1)
+            for tid, name in after:
+                entry = self._ensure(tid, name)
+                if tid not in old:
+                    entry[1] += 1
+
+    def suggest(self, prefix: str, limit: int) -> list[tuple[uuid.UUID, str, int]]:
+        with self.lock:
+            # Names sharing the prefix are contiguous from its insertion point.
+            hits = []
+            i = bisect.bisect_left(self.names, prefix)
+            while i < len(self.names) and self.names[i].startswith(prefix):
+                n = self.names[i]
+                hits.append((self.by_name[n][0], n, self.by_name[n][1]))
+                i += 1
+        hits.sort(key=lambda h: (-h[2], h[1]))
+        return hits[:limit]
+
+
+class TagIndex:
+    """Per-user tag prefix indexes, loaded lazily and LRU-evicted across users."""
+
+    def __init__(self, max_users: int):
+        self._users: UserLRU[_UserTags] = UserLRU(max_users)
+
+    def _load(self, db: Session, user_id: uuid.UUID) -> _UserTags:
+        rows = db.execute(
+            select(models.Tag.id, models.Tag.name, func.count(models.QuestionTag.question_id))
+            .outerjoin(models.QuestionTag, models.QuestionTag.tag_id == models.Tag.id)
+            .where(models.Tag.user_id == user_id)
+            .group_by(models.Tag.id, models.Tag.name)
+        ).all()
+        idx = _UserTags()
+        idx.load(rows)
+        return self._users.put(user_id, idx)
+
+    def warm(self, db: Session, user_id: uuid.UUID) -> int:
+        """Reload the user's tag counts; returns the number of tags."""
+        return len(self._load(db, user_id).names)
+
+    def suggest(self, db: Session, user_id: uuid.UUID, prefix: str, limit: int) -> list[tuple[uuid.UUID, str, int]]:
+        idx = self._users.get(user_id) or self._load(db, user_id)
+        return idx.suggest(prefix.strip().lower(), limit)
+
+    def retag(self, user_id: uuid.UUID, before: list[TagRef], after: list[TagRef]) -> None:
+        idx = self._users.get(user_id)  # None: counts are read fresh on first use
+        if idx is not None:
+            idx.retag(before, after)
+
+    def invalidate(self, user_id: uuid.UUID) -> None:
+        self._users.pop(user_id)
+
+
+tag_index = TagIndex(max_users=settings.TAG_INDEX_CACHE_USERS)
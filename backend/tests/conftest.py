@@ -0,0 +1,35 @@
+import os
+import sys
+
+import pytest
+
+# app.settings requires these. In-memory SQLite: the schema is created per test.
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("JWT_SECRET", "test")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def client():
+    """TestClient for the app on a fresh schema (no lifespan, so no job workers)."""
+    from fastapi.testclient import TestClient
+
+    from app import models  # noqa: F401  (register models)
+    from app.db import Base, engine
+    from app.main import app
+
+    Base.metadata.create_all(engine)
+    try:
+        yield TestClient(app)
+    finally:
+        Base.metadata.drop_all(engine)
+
+
+@pytest.fixture
+def user_client(client):
+    """client, registered and logged in."""
+    creds = {"email": "user@example.com", "password": "password1"}
+    assert client.post("/v1/auth/register", json=creds).status_code == 200
+    assert client.post("/v1/auth/login", json=creds).status_code == 200
+    return client
@@ -0,0 +1,52 @@
+import asyncio
+
+from app.admission import RouteGroup, check_pool_budget, parse_limits
+
+
+async def _burst(group: RouteGroup, n: int, timeout: float = 1.0) -> list[bool]:
+    # Admitted requests hold their slot until the whole burst has arrived.
+    arrived = asyncio.Event()
+
+    async def request() -> bool:
+        ok = await group.acquire(timeout)
+        if ok:
+            await arrived.wait()
+            group.release()
+        return ok
+
+    tasks = [asyncio.create_task(request()) for _ in range(n)]
+    await asyncio.sleep(0)
+    arrived.set()
+    return await asyncio.gather(*tasks)
+
+
+def test_burst_without_queue_sheds_everything_over_the_limit():
+    group = RouteGroup("x", 2, 0)
+    results = asyncio.run(_burst(group, 10))
+    assert results.count(True) == 2
+    assert (group.admitted, group.shed) == (2, 8)
+    assert (group.active, group.waiting) == (0, 0)
+
+
+def test_burst_queues_up_to_max_queue():
+    group = RouteGroup("x", 2, 3)
+    results = asyncio.run(_burst(group, 10))
+    assert results.count(True) == 5
+    assert (group.admitted, group.shed) == (5, 5)
+
+
+def test_queued_request_is_shed_on_timeout():
+    async def run() -> bool:
+        group = RouteGroup("x", 1, 1)
+        assert await group.acquire(1.0)
+        queued = await group.acquire(0.01)
+        assert (group.active, group.waiting, group.shed) == (1, 0, 1)
+        return queued
+
+    assert asyncio.run(run()) is False
+
+
+def test_pool_budget():
+    groups = parse_limits("auth=4:16,heavy=4:32,default=10:128")
+    assert check_pool_budget(groups, 20, 2)
+    assert not check_pool_budget(groups, 15, 2)
@@ -0,0 +1,29 @@
+def test_question_round_trip(user_client):
+    created = user_client.post(
+        "/v1/questions",
+        json={"question_text": "What is WAL?", "answer_md": "Write-ahead **log**", "tags": ["SQLite"]},
+    )
+    assert created.status_code == 200
+    qid = created.json()["id"]
+
+    listed = user_client.get("/v1/questions", params={"due_only": True, "render": "html"}).json()
+    assert [q["id"] for q in listed] == [qid]
+    assert listed[0]["tags"] == ["sqlite"]
+    assert "<strong>log</strong>" in listed[0]["answer_html"]
+
+    reviewed = user_client.post(f"/v1/questions/{qid}/review", params={"rating": "knew"})
+    assert reviewed.status_code == 200
+    assert user_client.get("/v1/questions", params={"due_only": True}).json() == []
+
+
+def test_dashboard_queries(user_client):
+    created = user_client.post("/v1/questions", json={"question_text": "What is mmap?", "answer_md": "a", "tags": ["t"]})
+    assert created.status_code == 200
+    assert user_client.get("/v1/dashboard/stats").json()["due_now"] == 1
+    forecast = user_client.get("/v1/dashboard/forecast", params={"days": 7, "intervals": "1,2,3"})
+    assert forecast.status_code == 200
+    assert sum(forecast.json()["due"]) == 1
+
+
+def test_schema_is_fresh_per_test(user_client):
+    assert user_client.get("/v1/questions").json() == []
@@ -0,0 +1,48 @@
+from fastapi.testclient import TestClient
+
+from app.main import app
+
+
+def _login(email: str) -> TestClient:
+    c = TestClient(app)
+    creds = {"email": email, "password": "password1"}
+    assert c.post("/v1/auth/register", json=creds).status_code == 200
+    assert c.post("/v1/auth/login", json=creds).status_code == 200
+    return c
+
+
+def _due(c: TestClient) -> int:
+    return sum(c.get("/v1/dashboard/forecast", params={"days": 7}).json()["due"])
+
+
+def test_question_in_several_decks(user_client):
+    qids = [
+        user_client.post("/v1/questions", json={"question_text": f"Question {i}", "answer_md": "a"}).json()["id"]
+        for i in range(2)
+    ]
+    d1 = user_client.post("/v1/decks", json={"name": "D1", "question_ids": qids}).json()["id"]
+    d2 = user_client.post("/v1/decks", json={"name": "D2", "question_ids": qids[:1]}).json()["id"]
+    counts = {d["id"]: d["question_count"] for d in user_client.get("/v1/decks").json()}
+    assert counts == {d1: 2, d2: 1}
+
+    assert user_client.delete(f"/v1/decks/{d2}/questions/{qids[0]}").status_code == 200
+    assert len(user_client.get(f"/v1/decks/{d1}/questions").json()) == 2
+
+
+def test_deleting_questions_refreshes_subscriber_forecast(user_client):
+    qids = [
+        user_client.post("/v1/questions", json={"question_text": f"Question {i}", "answer_md": "a"}).json()["id"]
+        for i in range(3)
+    ]
+    deck = user_client.post("/v1/decks", json={"name": "Shared", "question_ids": qids}).json()["id"]
+    subscriber = _login("subscriber@example.com")
+    subscriber.post(f"/v1/decks/{deck}/subscribe")
+    assert _due(subscriber) == 3
+    assert subscriber.get("/v1/dashboard/stats").json()["due_now"] == 3
+
+    user_client.delete(f"/v1/questions/{qids[0]}")
+    assert _due(subscriber) == 2
+
+    user_client.post("/v1/questions/bulk", json={"action": "delete", "ids": qids[1:]})
+    assert _due(subscriber) == 0
+    assert subscriber.get("/v1/dashboard/stats").json()["due_now"] == 0
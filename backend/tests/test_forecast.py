@@ -0,0 +1,92 @@
+from datetime import date, datetime, time, timedelta
+
+import numpy as np
+from sqlalchemy import select, update
+
+from app import models
+from app.db import SessionLocal
+from app.forecast import RATINGS, _FIRST_RATING, _infer_ratings, _project, what_if
+from app.jobs import _reschedule
+
+
+def _dt(*values) -> np.ndarray:
+    return np.array(values, dtype="datetime64[s]")
+
+
+def test_infer_ratings_picks_the_nearest_interval():
+    last = np.datetime64("2026-01-01T08:00:00")
+    next_at = last + np.array([1, 3, 7, 6, 2], dtype="timedelta64[D]")
+    ratings = _infer_ratings(next_at, np.full(5, last), np.ones(5, dtype=bool))
+    assert [RATINGS[r] for r in ratings] == ["forgot", "almost", "knew", "knew", "forgot"]
+
+
+def test_infer_ratings_never_reviewed_cards_get_the_first_rating():
+    next_at = _dt("2026-01-08T08:00:00", "2026-01-08T08:00:00")
+    last = _dt("2026-01-01T08:00:00", "2026-01-08T08:00:00")
+    ratings = _infer_ratings(next_at, last, np.array([True, False]))
+    assert ratings.tolist() == [RATINGS.index("knew"), _FIRST_RATING]
+
+
+def test_project_bins_each_repeat_by_day():
+    assert _project(np.array([0, 2]), np.array([3, 7]), 10) == [1, 0, 1, 1, 0, 0, 1, 0, 0, 2]
+    assert _project(np.array([], dtype=np.int64), np.array([], dtype=np.int64), 4) == [0, 0, 0, 0]
+
+
+def _user_cards(user_client, schedules):
+    """Create one question per (next_review_at, last_reviewed_at) pair; returns the user id."""
+    for i, _ in enumerate(schedules):
+        user_client.post("/v1/questions", json={"question_text": f"Question {i}", "answer_md": "a"})
+    with SessionLocal() as db:
+        user_id = db.execute(select(models.User.id)).scalar_one()
+        qids = db.execute(select(models.Question.id).order_by(models.Question.question_text)).scalars().all()
+        for qid, (next_at, last_at) in zip(qids, schedules):
+            db.execute(
+                update(models.Question)
+                .where(models.Question.id == qid)
+                .values(next_review_at=next_at, last_reviewed_at=last_at)
+            )
+        db.commit()
+    return user_id
+
+
+def test_what_if_under_a_custom_policy(user_client):
+    today = date.today()
+    noon = datetime.combine(today, time(12))
+    user_id = _user_cards(
+        user_client,
+        [
+            (noon + timedelta(days=5), noon - timedelta(days=2)),  # knew 2 days ago: due day 5
+            (noon - timedelta(days=4), noon - timedelta(days=5)),  # forgot, overdue: clipped to day 0
+            (noon, None),  # never reviewed: due today
+        ],
+    )
+    with SessionLocal() as db:
+        result = what_if(db, user_id, today, 10, [1, 2, 10])
+
+    # knew every 7 days from day 5, forgot every day, almost every 3 days from day 0
+    assert result["baseline"] == [2, 1, 1, 2, 1, 2, 2, 1, 1, 2]
+    # knew becomes last review + 10 = day 8; the never-reviewed card repeats every 2 days
+    assert result["projected"] == [2, 1, 2, 1, 2, 1, 2, 1, 3, 1]
+
+
+def test_reschedule_keeps_the_inferred_rating(user_client):
+    now = datetime.utcnow()
+    user_id = _user_cards(
+        user_client,
+        [
+            (now - timedelta(days=3), now - timedelta(days=10)),  # knew, overdue
+            (now - timedelta(hours=1), None),  # never reviewed
+        ],
+    )
+    with SessionLocal() as db:
+        job = models.Job(user_id=user_id, kind="reschedule", params={"days": 3})
+        assert _reschedule(db, job, lambda p: None)["rescheduled"] == 2
+        rows = db.execute(
+            select(models.Question.next_review_at, models.Question.last_reviewed_at).order_by(
+                models.Question.question_text
+            )
+        ).all()
+
+    (knew_next, knew_last), (new_next, new_last) = rows
+    assert knew_next >= now and knew_next - knew_last == timedelta(days=7)
+    assert new_last is None
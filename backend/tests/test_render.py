@@ -0,0 +1,39 @@
+import pytest
+
+from app.render import is_safe_url, markdown_cache
+
+
+@pytest.mark.parametrize(
+    "answer",
+    [
+        "[x](javascript:alert(1))",
+        "[x](JaVaScRiPt:alert(1))",
+        "[x](&#106;avascript:alert(1))",
+        "[x](&#x6a;avascript:alert(1))",
+        "[x](javascript&colon;alert(1))",
+        "[x](java\tscript:alert(1))",
+        "[x](<java\tscript:alert(1)>)",
+        "[x](\x01javascript:alert(1))",
+        "[x]( vbscript:msgbox(1))",
+        "[x](data:text/html;base64,PHNjcmlwdD4=)",
+        "[x][r]\n\n[r]: &#x6a;avascript:alert(1)",
+        "![i](&#x6a;avascript:alert(1))",
+    ],
+)
+def test_script_links_are_dropped(answer):
+    out = markdown_cache.render(answer)
+    assert "href=" not in out and "src=" not in out, out
+
+
+@pytest.mark.parametrize(
+    "url",
+    ["https://example.com/a?b=c", "http://example.com", "mailto:a@b.co", "/v1/questions", "#notes", "docs/x.md", "//cdn.example.com/i.png"],
+)
+def test_allowed_urls(url):
+    assert is_safe_url(url)
+    assert f'href="{url}"' in markdown_cache.render(f"[x]({url})")
+
+
+def test_raw_html_is_escaped():
+    out = markdown_cache.render('<script>alert(1)</script>\n\n<a href="javascript:alert(1)">x</a>')
+    assert "<script>" not in out and "<a " not in out
@@ -0,0 +1,24 @@
+import pytest
+from starlette.websockets import WebSocketDisconnect
+
+from app.settings import settings
+
+ALLOWED = settings.cors_list()[0]
+
+
+@pytest.mark.parametrize("headers", [{}, {"origin": "https://evil.example"}])
+def test_rejects_foreign_origin(user_client, headers):
+    with pytest.raises(WebSocketDisconnect) as exc:
+        with user_client.websocket_connect("/v1/study/ws", headers=headers) as ws:
+            ws.receive_json()
+    assert exc.value.code == 1008
+
+
+def test_streams_due_cards_to_allowed_origin(user_client):
+    qid = user_client.post("/v1/questions", json={"question_text": "What is a WAL?", "answer_md": "a"}).json()["id"]
+    with user_client.websocket_connect("/v1/study/ws", headers={"origin": ALLOWED}) as ws:
+        first = ws.receive_json()
+        assert first["card"]["id"] == qid
+        ws.send_json({"type": "rate", "id": qid, "rating": "knew"})
+        reviewed = ws.receive_json()
+        assert reviewed["type"] == "reviewed" and reviewed["next"] is None
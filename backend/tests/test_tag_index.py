@@ -0,0 +1,20 @@
+import uuid
+
+from app.tag_index import _UserTags
+
+
+def _index(*names: str) -> _UserTags:
+    idx = _UserTags()
+    idx.load([(uuid.uuid4(), name, i) for i, name in enumerate(names)])
+    return idx
+
+
+def test_suggest_includes_names_outside_the_bmp():
+    idx = _index("b", "c", "cache", "c\U0001f600", "d")
+    assert {n for _, n, _ in idx.suggest("c", 10)} == {"c", "cache", "c\U0001f600"}
+
+
+def test_suggest_orders_by_usage_and_limits():
+    idx = _index("sql", "sqlite", "sqlalchemy", "system")
+    assert [n for _, n, _ in idx.suggest("sql", 2)] == ["sqlalchemy", "sqlite"]
+    assert idx.suggest("zzz", 5) == []